@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Walk-forward backtest napovedovalnika (predict_tot_bha)
+• krog m napovemo samo s tekmami, odigranimi pred prvo tekmo kroga m (rez po
+  datumu – prestavljene tekme prejšnjih krogov ne pridejo v učni nabor)
+• moči so rez kumulativnih polj shrambe značilk (feature_store.model_asof)
+• log-loss, Brier in RPS (1X2) po krogih
+"""
+
+import sys, argparse, pathlib, numpy as np, pandas as pd
+
+import predict_tot_bha as ptb
+import dixon_coles
+import feature_store
+
+FIRST_MW    = 5            # prvi napovedani krog (prej ima premalo ekip tekme doma in v gosteh)
+OUT_DEFAULT = "backtest.csv"
+
+# ──────────────────────────────────────────────────────────────
+def outcome_probs(fixtures_model, form, fixtures, form_weight, form_n=5):
+    lam_h, lam_a, lam_s = ptb.fixture_lambdas(fixtures_model, None, fixtures,
+                                              form_weight, form_n, form=form)
+    m = ptb.markets(ptb.score_matrix(lam_h, lam_a, lam_s))
+    p = np.column_stack([m["pH"], m["pX"], m["pA"]])
+    return p / p.sum(axis=1, keepdims=True)         # rep nad MAX_GOALS
+
+def scores(p, y):
+    """log-loss, Brier in RPS; y = 0 (domači), 1 (remi), 2 (gostje)."""
+    o = np.eye(3)[y]
+    log_loss = -np.log(np.clip(p[np.arange(len(y)), y], 1e-15, None)).mean()
+    brier = ((p - o) ** 2).sum(axis=1).mean()
+    rps = ((np.cumsum(p, axis=1)[:, :2] - np.cumsum(o, axis=1)[:, :2]) ** 2).sum(axis=1).mean() / 2
+    return log_loss, brier, rps
+
+def kickoffs(df):
+    """{krog: datum prve tekme kroga} – meja, pred katero so vse učne tekme kroga."""
+    return pd.to_datetime(df["date"]).groupby(df["matchweek_number"]).min().to_dict()
+
+def run_backtest(df, fs=None, start=FIRST_MW, window=None, form_weight=ptb.FORM_WEIGHT,
+                 form_n=5, calib_weeks=0, calib=ptb.CALIB_METHOD, ls_floor=0.01,
+                 engine=ptb.ENGINE, xi=0.0):
+    """Krog m se napove s tekmami pred datumom prve tekme kroga m (rez po datumu, ne po
+    številki kroga – prestavljena tekma šteje šele, ko je odigrana).
+    window = število zadnjih krogov (po datumu prve tekme) pred učno mejo za moči
+    (None = vsi); calib_weeks > 0 odreže
+    tekme od prve tekme kroga m - calib_weeks naprej za calibrate_scaling (kot
+    train/valid v load_matches). engine="dc" vsak krog na novo oceni ML fitter
+    (topel start iz prejšnjega kroga). fs = shramba značilk (feature_store.build(df, form_n)),
+    če jo kličoči že ima. Vsak napovedani krog mora imeti vsaj en učni krog →
+    0 ≤ calib_weeks < start - 1."""
+    if not 0 <= calib_weeks < start - 1:
+        raise ValueError(f"calib_weeks={calib_weeks} pri start={start} ne pusti učnih krogov "
+                         f"(dovoljeno 0 … {start - 2}).")
+    fs = fs if fs is not None else feature_store.build(df, form_n)
+    kick = kickoffs(df)
+    starts = np.sort(np.array(list(kick.values()), dtype="datetime64[ns]"))
+    date = pd.to_datetime(df["date"])
+    y = np.select([df["home_goals"] > df["away_goals"],
+                   df["home_goals"] == df["away_goals"]], [0, 1], 2)
+    rows, theta = [], None
+    for m in range(start, int(df["matchweek_number"].max()) + 1):
+        fixtures = df[df["matchweek_number"] == m]
+        if fixtures.empty:
+            continue
+        until = kick[m]                                  # napoved: le tekme pred tem datumom
+        split = min(kick.get(m - calib_weeks, until), until)   # učne | kalibracijske tekme
+        prev = starts[starts < np.datetime64(split, "ns")]   # začetki krogov pred učno mejo
+        since = pd.Timestamp(prev[-window]) if window and len(prev) >= window else None
+        k_lo = feature_store.matchday(fs, since) if since is not None else 0
+        if feature_store.matchday(fs, split) <= k_lo:
+            raise ValueError(f"Krog {m}: ni učnih tekem pred {split:%Y-%m-%d}.")
+        if engine == "dc":
+            train = (date < split) & (date >= since) if since is not None else date < split
+            f = dixon_coles.fit(df[train], teams=fs["teams"], xi=xi, x0=theta)
+            theta, mdl = f["theta"], dixon_coles.to_model(f)
+        else:
+            mdl = feature_store.model_asof(fs, split, since, ls_floor)
+        if calib_weeks:
+            valida = df[(date >= split) & (date < until)]
+            sH, sA = ptb.calibrate_scaling(valida, mdl["teams"], mdl["H_att"], mdl["A_att"],
+                                           mdl["H_def"], mdl["A_def"],
+                                           mdl["home_avg"], mdl["away_avg"], calib)
+            mdl["home_avg"] *= sH
+            mdl["away_avg"] *= sA
+        p = outcome_probs(mdl, fs, fixtures, form_weight, form_n)
+        rows.append((m, len(fixtures), *scores(p, y[fixtures.index])))
+    return pd.DataFrame(rows, columns=["matchweek", "n", "log_loss", "brier", "rps"])
+
+def summary(res):
+    """Skupne mere čez vse ocenjene kroge, utežene s številom tekem v krogu
+    (krog brez končnih mer ne šteje ne v n ne v uteži)."""
+    res = res[np.isfinite(res[["log_loss", "brier", "rps"]]).all(axis=1)]
+    w = res["n"] / res["n"].sum()
+    return dict(n=int(res["n"].sum()), log_loss=(w * res["log_loss"]).sum(),
+                brier=(w * res["brier"]).sum(), rps=(w * res["rps"]).sum())
+
+# ──────────────────────────────────────────────────────────────
+def main(csv, out=OUT_DEFAULT, league=None, season=None, **params):
+    df = ptb.read_season(csv, league, season)
+    df = df[df["home_goals"].notna()].reset_index(drop=True)
+    res = run_backtest(df, **params)
+    res.to_csv(out, index=False, float_format="%.4f")
+    s = summary(res)
+    print(res.to_string(index=False, float_format="%.4f"))
+    print(f"\nSkupaj ({s['n']} tekem): "
+          f"log-loss={s['log_loss']:.4f}  "
+          f"Brier={s['brier']:.4f}  RPS={s['rps']:.4f}")
+    print(f"Rezultati shranjeni v '{out}'.")
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("csv", nargs="?", default=ptb.CSV_DEFAULT,
+                    help="CSV ali imenik shrambe match_store")
+    ap.add_argument("--league")
+    ap.add_argument("--season")
+    ap.add_argument("--start", type=int, default=FIRST_MW)
+    ap.add_argument("--window", type=int, help="število zadnjih krogov za moči")
+    ap.add_argument("--form-weight", type=float, default=ptb.FORM_WEIGHT)
+    ap.add_argument("--form-n", type=int, default=5)
+    ap.add_argument("--calib-weeks", type=int, default=0)
+    ap.add_argument("--calib", choices=("mean", "mle"), default=ptb.CALIB_METHOD)
+    ap.add_argument("--ls-floor", type=float, default=0.01)
+    ap.add_argument("--model", choices=("tables", "dc"), default=ptb.ENGINE)
+    ap.add_argument("--xi", type=float, default=0.0)
+    ap.add_argument("--out", default=OUT_DEFAULT)
+    args = ap.parse_args()
+    if not 0 <= args.calib_weeks < args.start - 1:
+        ap.error(f"--calib-weeks mora biti med 0 in {args.start - 2} (--start {args.start}).")
+    if args.window is not None and args.window < 1:
+        ap.error("--window mora biti vsaj 1.")
+    if not pathlib.Path(args.csv).exists():
+        sys.exit(f"CSV datoteka '{args.csv}' ne obstaja.")
+    main(args.csv, args.out, args.league, args.season, start=args.start, window=args.window,
+         form_weight=args.form_weight, form_n=args.form_n,
+         calib_weeks=args.calib_weeks, calib=args.calib, ls_floor=args.ls_floor,
+         engine=args.model, xi=args.xi)
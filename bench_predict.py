@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Merjenje hitrosti napovedovalnika (predict_tot_bha) po korakih in velikostih podatkov
+• koraki: load_matches, build_tables, calibrate_scaling, form_adjust, fixture_lambdas,
+  simulate, aggregate (histogram izidov + trgi), score_matrix (točna matrika + trgi)
+• velikosti: ena sezona, deset sezon, 100 lig – sintetični podatki s fiksnim semenom,
+  da so meritve primerljive med računalniki in različicami kode
+• za vsak korak: najboljši čas od --repeat ponovitev in vrh pomnilnika (tracemalloc,
+  v ločeni ponovitvi, da sledenje ne popači časa)
+• primerjava z osnovo (bench_baseline.json): korak, ki je počasnejši ali porabi več
+  pomnilnika za več kot --threshold, je regresija → izhodna koda 1
+
+Primeri:
+    python bench_predict.py --save                    # zapiši novo osnovo
+    python bench_predict.py                           # primerjaj z osnovo
+    python bench_predict.py --sizes season --repeat 10 --threshold 0.1
+    python bench_predict.py --csv scrape_pl_24_25_02.csv   # še prava sezona
+"""
+
+import sys, json, time, argparse, pathlib, platform, tempfile, tracemalloc
+import numpy as np, pandas as pd
+
+import predict_tot_bha as ptb
+
+BASELINE_FILE = "bench_baseline.json"
+THRESHOLD     = 0.25       # +25 % časa / pomnilnika = regresija
+MIN_DELTA_S   = 0.002      # krajših razlik ne štejemo (šum merjenja)
+MIN_DELTA_MB  = 1.0
+REPEAT        = 5
+SIMS          = 5_000      # simulacij na tekmo (100 lig × 10 tekem × SIMS × 3 polja int64)
+TEAMS         = 20
+SEED          = 2024
+
+# ime velikosti → (št. lig, št. sezon)
+SIZES = {
+    "season":     (1, 1),
+    "10seasons":  (1, 10),
+    "100leagues": (100, 1),
+}
+
+# ──────────────────────────────────────────────────────────────
+def _round_robin(n):
+    """Dvokrožni razpored (krožna metoda): seznam krogov s pari (doma, gost)."""
+    arr = list(range(n))
+    rounds = []
+    for r in range(n - 1):
+        pairs = [(arr[i], arr[n - 1 - i]) for i in range(n // 2)]
+        rounds.append([(h, a) if r % 2 else (a, h) for h, a in pairs])
+        arr = [arr[0], arr[-1], *arr[1:-1]]
+    return rounds + [[(a, h) for h, a in rnd] for rnd in rounds]
+
+def synthetic(leagues, seasons, teams=TEAMS, seed=SEED):
+    """Tekme v obliki scrape_pl_24_25_02.csv; moči ekip in xG iz fiksnega semena."""
+    rng = np.random.default_rng(seed)
+    rounds = _round_robin(teams)
+    mw = np.repeat(np.arange(1, len(rounds) + 1), teams // 2)
+    pairs = np.array([p for rnd in rounds for p in rnd])
+    att = rng.lognormal(0.0, 0.25, (leagues, teams))
+    dfn = rng.lognormal(0.0, 0.20, (leagues, teams))
+    parts = []
+    for s in range(seasons):
+        start = pd.Timestamp(f"{2025 - seasons + s}-08-10")
+        date = start + pd.to_timedelta((mw - 1) * 7, unit="D")
+        for l in range(leagues):
+            h, a = pairs[:, 0], pairs[:, 1]
+            hx = rng.gamma(4.0, 1.5 * att[l, h] * dfn[l, a] / 4.0)
+            ax = rng.gamma(4.0, 1.2 * att[l, a] * dfn[l, h] / 4.0)
+            names = np.array([f"L{l:03d} T{t:02d}" for t in range(teams)], dtype=object)
+            parts.append(pd.DataFrame({
+                "matchweek_number": mw, "match_id": np.arange(1, len(mw) + 1),
+                "date": date.strftime("%Y-%m-%d"),
+                "home_team": names[h], "away_team": names[a],
+                "home_goals": rng.poisson(hx), "away_goals": rng.poisson(ax),
+                "home_xG": hx.round(1), "away_xG": ax.round(1),
+            }))
+    df = pd.concat(parts, ignore_index=True)
+    df["home_xGA"], df["away_xGA"] = df["away_xG"], df["home_xG"]
+    return df
+
+# ──────────────────────────────────────────────────────────────
+def stages(csv_path, sims=SIMS):
+    """Koraki kot (ime, funkcija(ctx)); rezultat koraka se shrani v ctx[ime]."""
+    def load(ctx):
+        return ptb.load_matches(csv_path, date=None)
+
+    def tables(ctx):
+        return ptb.build_tables(ctx["load_matches"][1])
+
+    def calib(ctx):
+        return ptb.calibrate_scaling(ctx["load_matches"][2], *ctx["build_tables"])
+
+    def form(ctx):
+        played = ctx["load_matches"][0]
+        return ptb.form_adjust(played, played["home_team"].iloc[-1],
+                               date=played["date"].max() + pd.Timedelta(days=1))
+
+    def lambdas(ctx):
+        played = ctx["load_matches"][0]
+        fixtures = played.loc[played["matchweek_number"] == played["matchweek_number"].max(),
+                              ["date", "home_team", "away_team"]]
+        model = ptb.fit_model(ctx["load_matches"][1], ctx["load_matches"][2])
+        return ptb.fixture_lambdas(model, played, fixtures)
+
+    def sim(ctx):
+        return ptb.simulate(*ctx["fixture_lambdas"], sims, np.random.default_rng(SEED))
+
+    def aggregate(ctx):
+        return ptb.mc_markets(*ctx["simulate"])
+
+    def exact(ctx):
+        return ptb.markets(ptb.score_matrix(*ctx["fixture_lambdas"]))
+
+    return [("load_matches", load), ("build_tables", tables),
+            ("calibrate_scaling", calib), ("form_adjust", form),
+            ("fixture_lambdas", lambdas), ("simulate", sim),
+            ("aggregate", aggregate), ("score_matrix", exact)]
+
+def measure(fn, ctx, repeat=REPEAT):
+    """(rezultat, najboljši čas v s, vrh pomnilnika v MB)."""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn(ctx)
+        best = min(best, time.perf_counter() - t0)
+    del out
+    tracemalloc.start()
+    try:
+        out = fn(ctx)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return out, best, peak / 2**20
+
+def run_size(df, repeat=REPEAT, sims=SIMS, log=print):
+    """Vsi koraki na enem naboru tekem → {korak: {time_s, peak_mb}}."""
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = pathlib.Path(tmp) / "matches.csv"
+        df.to_csv(csv_path, index=False)
+        ctx, res = {}, {}
+        for name, fn in stages(csv_path, sims):
+            ctx[name], t, peak = measure(fn, ctx, repeat)
+            res[name] = {"time_s": t, "peak_mb": peak}
+            if log:
+                log(f"  {name:<18} {t * 1000:10.2f} ms {peak:10.1f} MB")
+    return res
+
+def run(sizes, repeat=REPEAT, sims=SIMS, csv=None, log=print):
+    """{velikost/korak: {time_s, peak_mb}} za vse izbrane velikosti."""
+    data = {name: (lambda n=name: synthetic(*SIZES[n])) for name in sizes}
+    if csv is not None:
+        data["csv"] = lambda: ptb.read_season(csv)
+    results = {}
+    for name, make in data.items():
+        df = make()
+        if log:
+            log(f"\n{name}: {len(df):,} tekem")
+        for stage, r in run_size(df, repeat, sims, log).items():
+            results[f"{name}/{stage}"] = r
+    return results
+
+# ──────────────────────────────────────────────────────────────
+def meta(sims=SIMS):
+    return {"python": platform.python_version(), "numpy": np.__version__,
+            "pandas": pd.__version__, "machine": platform.machine(),
+            "platform": platform.platform(), "sims": sims}
+
+def save_baseline(results, path=BASELINE_FILE, sims=SIMS):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"meta": meta(sims), "results": results}, f, indent=2)
+
+def load_baseline(path=BASELINE_FILE):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def compare(results, baseline, threshold=THRESHOLD):
+    """Tabela trenutno / osnova po koraku; stolpec regression označi prekoračitve."""
+    rows = []
+    for key, r in results.items():
+        b = baseline["results"].get(key)
+        if b is None:
+            rows.append({"stage": key, "time_ms": r["time_s"] * 1000, "peak_mb": r["peak_mb"]})
+            continue
+        slow = (r["time_s"] > b["time_s"] * (1 + threshold)
+                and r["time_s"] - b["time_s"] > MIN_DELTA_S)
+        fat = (r["peak_mb"] > b["peak_mb"] * (1 + threshold)
+               and r["peak_mb"] - b["peak_mb"] > MIN_DELTA_MB)
+        rows.append({"stage": key, "time_ms": r["time_s"] * 1000,
+                     "base_ms": b["time_s"] * 1000, "time_ratio": r["time_s"] / b["time_s"],
+                     "peak_mb": r["peak_mb"], "base_mb": b["peak_mb"],
+                     "regression": ",".join(n for n, bad in (("time", slow), ("mem", fat)) if bad)})
+    return pd.DataFrame(rows)
+
+# ──────────────────────────────────────────────────────────────
+def main(sizes, repeat=REPEAT, sims=SIMS, csv=None, baseline=BASELINE_FILE,
+         save=False, threshold=THRESHOLD, out=None):
+    results = run(sizes, repeat, sims, csv)
+    if out:
+        with open(out, "w", encoding="utf-8") as f:
+            json.dump({"meta": meta(sims), "results": results}, f, indent=2)
+    if save:
+        save_baseline(results, baseline, sims)
+        print(f"\nOsnova shranjena v '{baseline}'.")
+        return 0
+    if not pathlib.Path(baseline).exists():
+        print(f"\nOsnova '{baseline}' ne obstaja – zapiši jo z --save.")
+        return 0
+    base = load_baseline(baseline)
+    if base["meta"].get("sims") != sims:
+        sys.exit(f"Osnova je izmerjena z --sims {base['meta'].get('sims')}, ne {sims}.")
+    tab = compare(results, base, threshold)
+    print(f"\nPrimerjava z osnovo '{baseline}' (prag +{threshold:.0%}):")
+    print(tab.to_string(index=False, float_format="%.2f", na_rep=""))
+    bad = tab[tab["regression"].fillna("") != ""] if "regression" in tab else tab.iloc[:0]
+    if len(bad):
+        print(f"\nREGRESIJA v {len(bad)} korakih: {', '.join(bad['stage'])}")
+        return 1
+    print("\nBrez regresij.")
+    return 0
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Merjenje hitrosti korakov napovedovalnika.")
+    ap.add_argument("--sizes", nargs="+", choices=list(SIZES), default=list(SIZES))
+    ap.add_argument("--csv", help="dodatno izmeri še to sezono (CSV ali shramba)")
+    ap.add_argument("--repeat", type=int, default=REPEAT)
+    ap.add_argument("--sims", type=int, default=SIMS)
+    ap.add_argument("--baseline", default=BASELINE_FILE)
+    ap.add_argument("--save", action="store_true", help="zapiši rezultate kot novo osnovo")
+    ap.add_argument("--threshold", type=float, default=THRESHOLD,
+                    help="dovoljeno relativno poslabšanje (0.25 = +25 %%)")
+    ap.add_argument("--out", help="rezultate zapiši še v ta JSON")
+    args = ap.parse_args()
+    if args.csv and not pathlib.Path(args.csv).exists():
+        sys.exit(f"CSV datoteka '{args.csv}' ne obstaja.")
+    sys.exit(main(args.sizes, args.repeat, args.sims, args.csv, args.baseline,
+                  args.save, args.threshold, args.out))
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Merjenje hitrosti razčlenjevanja strani FBref na posnetem korpusu (brez omrežja)
+• korpus: fbref_replay.py (razporedi + poročila tekem, zgradba fbref_cache)
+• koraki na razporedih: get_table_html, build_dataframe (scrape_pl_24_25_03) in
+  build_dataframe_02 (scrape_pl_24_25_02); na poročilih: fbref_report.extract in
+  fetch_match_cards (scrape_pl_24_25_03_test, z branjem iz korpusa)
+• za vsak korak: najboljši čas od --repeat ponovitev čez vse strani (ms/stran,
+  strani/s), vrh pomnilnika in povzetek izhoda (sha256) – korpus je fiksen, zato
+  je izhod determinističen
+• primerjava z osnovo (bench_scrape_baseline.json) kot bench_predict.py: počasnejši
+  ali požrešnejši korak ali spremenjen izhod je regresija → izhodna koda 1
+
+Primeri:
+    python bench_scrape.py --save                     # zapiši novo osnovo
+    python bench_scrape.py                            # primerjaj z osnovo
+    python bench_scrape.py --corpus fbref_corpus --repeat 10 --threshold 0.1
+"""
+
+import sys, json, hashlib, argparse, pathlib, platform
+import pandas as pd
+
+import fbref_cache
+import fbref_replay
+import fbref_report
+import bench_predict
+import scrape_pl_24_25_02 as s02
+import scrape_pl_24_25_03 as s03
+import scrape_pl_24_25_03_test as s03t
+
+BASELINE_FILE = "bench_scrape_baseline.json"
+THRESHOLD     = bench_predict.THRESHOLD
+REPEAT        = 5
+
+# ──────────────────────────────────────────────────────────────
+def load_corpus(corpus):
+    """{vrsta strani: [(url, html)]} iz korpusa, urejeno po URL-ju."""
+    pages = {}
+    for m in fbref_cache.entries(corpus):
+        pages.setdefault(m["kind"], []).append((m["url"], fbref_replay.fetch(m["url"], corpus)))
+    return pages
+
+def stages():
+    """(vrsta strani, ime koraka, funkcija(url, html)); koraki razporeda dobijo izrez tabele."""
+    table = s03.get_table_html
+    return [("schedule", "get_table_html",     lambda url, html: table(html)),
+            ("schedule", "build_dataframe",    lambda url, html: s03.build_dataframe(table(html))),
+            ("schedule", "build_dataframe_02", lambda url, html: s02.build_dataframe(table(html))),
+            ("match",    "fbref_report.extract", lambda url, html: fbref_report.extract(html)),
+            ("match",    "fetch_match_cards",  lambda url, html: s03t.fetch_match_cards(url))]
+
+def digest(outputs):
+    """sha256 izhodov vseh strani (DataFrame → CSV) – spremenjen izhod = regresija."""
+    norm = [o.to_csv(index=False) if isinstance(o, pd.DataFrame) else o for o in outputs]
+    return hashlib.sha256(json.dumps(norm, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+def run(corpus, repeat=REPEAT, log=print):
+    """{vrsta/korak: {time_s, peak_mb, pages, ms_per_page, pages_per_s, digest}}."""
+    fbref_replay.REPLAY, fbref_replay.CORPUS_DIR = True, pathlib.Path(corpus)  # fetch_match_cards
+    pages = load_corpus(corpus)
+    results = {}
+    for kind, name, fn in stages():
+        todo = pages.get(kind, [])
+        if not todo:
+            continue
+        out, t, peak = bench_predict.measure(lambda ctx: [fn(u, h) for u, h in todo], None, repeat)
+        results[f"{kind}/{name}"] = r = {
+            "time_s": t, "peak_mb": peak, "pages": len(todo),
+            "ms_per_page": t * 1000 / len(todo), "pages_per_s": len(todo) / t if t else float("inf"),
+            "digest": digest(out)}
+        if log:
+            log(f"  {kind + '/' + name:<30} {r['ms_per_page']:9.2f} ms/stran "
+                f"{r['pages_per_s']:9.1f} strani/s {peak:8.1f} MB")
+    return results
+
+def meta(corpus):
+    return {"python": platform.python_version(), "pandas": pd.__version__,
+            "machine": platform.machine(), "platform": platform.platform(),
+            "pages": {k: len(v) for k, v in sorted(load_corpus(corpus).items())}}
+
+def compare(results, baseline, threshold=THRESHOLD):
+    """Kot bench_predict.compare; dodatno označi korake s spremenjenim izhodom (output)."""
+    tab = bench_predict.compare(results, baseline, threshold)
+    base = baseline["results"]
+    changed = [k in base and results[k]["digest"] != base[k].get("digest") for k in tab["stage"]]
+    old = tab["regression"].fillna("") if "regression" in tab else [""] * len(tab)
+    tab["regression"] = [",".join(filter(None, (r, "output" if c else ""))) for r, c in zip(old, changed)]
+    return tab
+
+# ──────────────────────────────────────────────────────────────
+def main(corpus=fbref_replay.CORPUS_DIR, repeat=REPEAT, baseline=BASELINE_FILE,
+         save=False, threshold=THRESHOLD, out=None):
+    print(f"Korpus '{corpus}':")
+    results = run(corpus, repeat)
+    if not results:
+        sys.exit(f"Korpus '{corpus}' je prazen – posnemi ga (glej fbref_replay.py).")
+    info = {"meta": meta(corpus), "results": results}
+    if out:
+        with open(out, "w", encoding="utf-8") as f:
+            json.dump(info, f, indent=2)
+    if save:
+        with open(baseline, "w", encoding="utf-8") as f:
+            json.dump(info, f, indent=2)
+        print(f"\nOsnova shranjena v '{baseline}'.")
+        return 0
+    if not pathlib.Path(baseline).exists():
+        print(f"\nOsnova '{baseline}' ne obstaja – zapiši jo z --save.")
+        return 0
+    with open(baseline, encoding="utf-8") as f:
+        base = json.load(f)
+    if base["meta"].get("pages") != info["meta"]["pages"]:
+        sys.exit(f"Osnova je izmerjena na drugem korpusu ({base['meta'].get('pages')}).")
+    tab = compare(results, base, threshold)
+    print(f"\nPrimerjava z osnovo '{baseline}' (prag +{threshold:.0%}):")
+    print(tab.to_string(index=False, float_format="%.2f", na_rep=""))
+    bad = tab[tab["regression"] != ""]
+    if len(bad):
+        print(f"\nREGRESIJA v {len(bad)} korakih: {', '.join(bad['stage'])}")
+        return 1
+    print("\nBrez regresij.")
+    return 0
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Hitrost razčlenjevanja strani FBref na posnetem korpusu.")
+    ap.add_argument("--corpus", default=str(fbref_replay.CORPUS_DIR))
+    ap.add_argument("--repeat", type=int, default=REPEAT)
+    ap.add_argument("--baseline", default=BASELINE_FILE)
+    ap.add_argument("--save", action="store_true", help="zapiši rezultate kot novo osnovo")
+    ap.add_argument("--threshold", type=float, default=THRESHOLD,
+                    help="dovoljeno relativno poslabšanje (0.25 = +25 %%)")
+    ap.add_argument("--out", help="rezultate zapiši še v ta JSON")
+    args = ap.parse_args()
+    if not pathlib.Path(args.corpus).is_dir():
+        sys.exit(f"Korpus '{args.corpus}' ne obstaja – posnemi ga (glej fbref_replay.py).")
+    sys.exit(main(pathlib.Path(args.corpus), args.repeat, args.baseline,
+                  args.save, args.threshold, args.out))
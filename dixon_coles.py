@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+ML fitter: bivariantni Poisson z moči napada/obrambe (Dixon–Coles)
+• log λ1 = μ + dom + napad[h] − obramba[g],  log λ2 = μ + napad[g] − obramba[h]
+• λ3 (skupni goli) ocenjen skupaj z ostalimi parametri
+• opcijske časovne uteži w = exp(−ξ · dni pred zadnjo tekmo)
+• vektorizirana log-verjetnost + analitični gradient → scipy L-BFGS-B
+"""
+
+import sys, argparse, pathlib, numpy as np, pandas as pd
+from scipy.optimize import minimize
+from scipy.special import gammaln, logsumexp
+
+import match_store
+
+XI_DEFAULT = 0.0           # ξ na dan; Dixon–Coles priporočata ~0.0065
+RIDGE      = 0.01          # L2 kazen na napad/obrambo (v zgodnjih krogih ML sicer divergira)
+
+# ──────────────────────────────────────────────────────────────
+def time_weights(dates, xi=XI_DEFAULT, ref=None):
+    dates = pd.to_datetime(dates)
+    ref = dates.max() if ref is None else pd.Timestamp(ref)
+    days = (ref - dates) / pd.Timedelta(days=1)
+    return np.exp(-xi * np.asarray(days, dtype=float))
+
+def _prepare(x, y):
+    """Konstantni deli log-členov vsote po k (skupni goli) za vse tekme naenkrat."""
+    K = int(np.minimum(x, y).max()) + 1
+    k = np.arange(K)
+    valid = k[None, :] <= np.minimum(x, y)[:, None]
+    xk = np.where(valid, x[:, None] - k, 0)
+    yk = np.where(valid, y[:, None] - k, 0)
+    const = np.where(valid, -gammaln(xk + 1) - gammaln(yk + 1) - gammaln(k + 1), -np.inf)
+    return k, xk, yk, const
+
+def _split(theta, T):
+    mu, home, eta3 = theta[:3]
+    a, d = theta[3:3 + T], theta[3 + T:]
+    return mu, home, eta3, a - a.mean(), d - d.mean()   # vsota napadov/obramb = 0
+
+def neg_loglik(theta, h, g, x, y, w, T, pre, ridge=RIDGE):
+    mu, home, eta3, att, dfn = _split(theta, T)
+    eta1 = mu + home + att[h] - dfn[g]
+    eta2 = mu + att[g] - dfn[h]
+    l1, l2, l3 = np.exp(eta1), np.exp(eta2), np.exp(eta3)
+
+    k, xk, yk, const = pre
+    t = const + xk * eta1[:, None] + yk * eta2[:, None] + k * eta3
+    logS = logsumexp(t, axis=1)
+    r = np.exp(t - logS[:, None])                       # posterior nad k
+    ll = -(l1 + l2 + l3) + logS
+
+    # d ll / d η_j = −λ_j + E[goli komponente j]
+    g1 = w * (-l1 + (r * xk).sum(1))
+    g2 = w * (-l2 + (r * yk).sum(1))
+    g3 = w * (-l3 + (r * k).sum(1))
+    ga = np.bincount(h, g1, T) + np.bincount(g, g2, T)
+    gd = -np.bincount(g, g1, T) - np.bincount(h, g2, T)
+    grad = np.concatenate([[g1.sum() + g2.sum(), g1.sum(), g3.sum()],
+                           ga - ga.mean(), gd - gd.mean()])
+    W = w.sum()
+    pen = 0.5 * ridge * (att @ att + dfn @ dfn)
+    grad_pen = np.concatenate([np.zeros(3), ridge * att, ridge * dfn])
+    return -(w * ll).sum() / W + pen, -grad / W + grad_pen
+
+def fit(df, teams=None, xi=XI_DEFAULT, ref=None, x0=None, ridge=RIDGE):
+    """Oceni parametre na odigranih tekmah df; teams = indeks ekip (privzeto iz df)."""
+    if teams is None:
+        teams = pd.Index(sorted(set(df["home_team"]) | set(df["away_team"])))
+    T = len(teams)
+    h = teams.get_indexer(df["home_team"])
+    g = teams.get_indexer(df["away_team"])
+    x = df["home_goals"].to_numpy(int)
+    y = df["away_goals"].to_numpy(int)
+    w = time_weights(df["date"], xi, ref) if xi else np.ones(len(df))
+    if x0 is None:
+        x0 = np.concatenate([[np.log(max(y.mean(), 0.1)), 0.2, np.log(0.1)], np.zeros(2 * T)])
+    bounds = [(None, None)] * 2 + [(np.log(1e-4), np.log(2.0))] + [(None, None)] * (2 * T)
+    res = minimize(neg_loglik, x0, args=(h, g, x, y, w, T, _prepare(x, y), ridge),
+                   jac=True, method="L-BFGS-B", bounds=bounds)
+    mu, home, eta3, att, dfn = _split(res.x, T)
+    return dict(teams=teams, mu=mu, home=home, l3=np.exp(eta3), att=att, dfn=dfn,
+                theta=res.x, nll=res.fun, success=res.success, nit=res.nit)
+
+def to_model(fit):
+    """Pretvori fit v model za predict_tot_bha.fixture_lambdas.
+
+    λ_home = exp(μ+dom)·exp(napad_h)·exp(−obramba_g) + λ3 (offset), enako za goste."""
+    att, dfn = np.exp(fit["att"]), np.exp(-fit["dfn"])
+    return dict(teams=fit["teams"], H_att=att, A_att=att, H_def=dfn, A_def=dfn,
+                home_avg=np.exp(fit["mu"] + fit["home"]), away_avg=np.exp(fit["mu"]),
+                shared=fit["l3"], offset=fit["l3"])
+
+# ──────────────────────────────────────────────────────────────
+def main(csv, xi=XI_DEFAULT, league=None, season=None):
+    """Fit na CSV ali na shrambi; iz shrambe lahko več sezon hkrati (smiselno z --xi)."""
+    df = match_store.read_matches(csv, league, season,
+                                  ["date", "home_team", "away_team", "home_goals", "away_goals"])
+    df = df[df["home_goals"].notna()]
+    f = fit(df, xi=xi)
+    print(f"Konvergenca: {f['success']} ({f['nit']} iteracij), "
+          f"−log L / tekmo = {f['nll']:.4f}")
+    print(f"μ={f['mu']:.3f}  domači={f['home']:.3f}  λ3={f['l3']:.3f}\n")
+    tab = pd.DataFrame({"napad": f["att"], "obramba": f["dfn"]}, index=f["teams"])
+    print(tab.sort_values("napad", ascending=False).to_string(float_format="%.3f"))
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("csv", nargs="?", default="scrape_pl_24_25_02.csv",
+                    help="CSV ali imenik shrambe match_store")
+    ap.add_argument("--xi", type=float, default=XI_DEFAULT, help="časovno pojemanje na dan")
+    ap.add_argument("--league", nargs="+", help="lige v shrambi")
+    ap.add_argument("--season", nargs="+", help="sezone v shrambi")
+    args = ap.parse_args()
+    if not pathlib.Path(args.csv).exists():
+        sys.exit(f"CSV datoteka '{args.csv}' ne obstaja.")
+    main(args.csv, args.xi, args.league, args.season)
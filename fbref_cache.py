@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Lokalni predpomnilnik HTML strani s FBref (skupen vsem scraperjem)
+-------------------------------------------------------------------
+• ključ = sha256(URL) → .fbref_cache/ab/abcdef….html.gz + .json (meta)
+• TTL po vrsti strani: razpored se osveži, poročila odigranih tekem nikoli
+• pogojna revalidacija (ETag / Last-Modified) za HTTP seje
+• način (okoljska spremenljivka FBREF_CACHE):
+    ttl      – uporabi svežo kopijo, sicer prenesi (privzeto)
+    missing  – uporabi katerokoli kopijo, prenesi le manjkajoče strani
+    refresh  – vedno prenesi in prepiši kopijo
+• ista zgradba map služi tudi kot posneti korpus za delo brez omrežja
+  (read / entries z drugim korenom – glej fbref_replay.py)
+"""
+
+import os
+import gzip
+import json
+import time
+import shutil
+import hashlib
+from pathlib import Path
+from typing import Callable
+
+CACHE_DIR = Path(os.environ.get("FBREF_CACHE_DIR", ".fbref_cache"))
+MODE = os.environ.get("FBREF_CACHE", "ttl")
+
+# TTL v sekundah; None = nikoli ne poteče
+TTL = {
+    "schedule": 6 * 3600,
+    "match": None,          # poročilo odigrane tekme se ne spreminja
+    "other": 24 * 3600,
+}
+
+
+def page_kind(url: str) -> str:
+    if "/matches/" in url:
+        return "match"
+    if "/schedule/" in url:
+        return "schedule"
+    return "other"
+
+
+def _paths(url: str, root: Path | None = None) -> tuple[Path, Path]:
+    key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+    base = (root or CACHE_DIR) / key[:2] / key
+    return base.with_suffix(".html.gz"), base.with_suffix(".json")
+
+
+def _read_meta(url: str) -> dict | None:
+    """Meta podatki kopije; manjkajoča ali nečitljiva (prekinjen zapis) → None (zgrešitev)."""
+    body, meta = _paths(url)
+    if not (body.exists() and meta.exists()):
+        return None
+    try:
+        return json.loads(meta.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def _write_meta(path: Path, meta: dict) -> None:
+    tmp = path.with_suffix(".json.tmp")
+    tmp.write_text(json.dumps(meta), encoding="utf-8")
+    os.replace(tmp, path)                       # atomarno, kot telo strani
+
+
+def _read_body(url: str, root: Path | None = None) -> str:
+    with gzip.open(_paths(url, root)[0], "rt", encoding="utf-8") as fh:
+        return fh.read()
+
+
+def _is_fresh(meta: dict) -> bool:
+    ttl = TTL.get(meta.get("kind", "other"))
+    return ttl is None or time.time() - meta["fetched_at"] < ttl
+
+
+def lookup(url: str, mode: str | None = None) -> str | None:
+    """Vrne shranjen HTML, če ga glede na način in TTL smemo uporabiti."""
+    mode = mode or MODE
+    if mode == "refresh":
+        return None
+    meta = _read_meta(url)
+    if meta is None or (mode == "ttl" and not _is_fresh(meta)):
+        return None
+    try:
+        return _read_body(url)
+    except (OSError, EOFError, ValueError):     # poškodovana kopija → prenesi znova
+        return None
+
+
+def read(url: str, root: Path | None = None) -> str | None:
+    """Katerakoli kopija strani ne glede na TTL (predpomnilnik ali korpus v root); None, če je ni."""
+    try:
+        return _read_body(url, root)
+    except (OSError, EOFError, ValueError):
+        return None
+
+
+def entries(root: Path | None = None) -> list[dict]:
+    """Meta podatki vseh shranjenih strani (url, kind, fetched_at …), urejeni po URL-ju."""
+    out = []
+    for meta in (root or CACHE_DIR).glob("??/*.json"):
+        try:
+            out.append(json.loads(meta.read_text(encoding="utf-8")))
+        except (OSError, ValueError):
+            continue
+    return sorted(out, key=lambda m: m["url"])
+
+
+def copy(url: str, dst: Path, root: Path | None = None) -> None:
+    """Kopira stran (telo + meta) iz predpomnilnika v drug koren, npr. posneti korpus."""
+    for src, out in zip(_paths(url, root), _paths(url, dst)):
+        out.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(src, out)
+
+
+def store(url: str, html: str, headers: dict | None = None) -> None:
+    body, meta = _paths(url)
+    body.parent.mkdir(parents=True, exist_ok=True)
+    tmp = body.with_suffix(".tmp")
+    with gzip.open(tmp, "wt", encoding="utf-8", compresslevel=6) as fh:
+        fh.write(html)
+    os.replace(tmp, body)                       # atomarno – varno za vzporedne niti
+    headers = headers or {}
+    _write_meta(meta, {
+        "url": url,
+        "kind": page_kind(url),
+        "fetched_at": time.time(),
+        "etag": headers.get("ETag"),
+        "last_modified": headers.get("Last-Modified"),
+    })
+
+
+def _touch(url: str, meta: dict) -> None:
+    meta["fetched_at"] = time.time()
+    _write_meta(_paths(url)[1], meta)
+
+
+def cached_fetch(url: str, fetch: Callable[[str], str], mode: str | None = None) -> str:
+    """Za prenose brez pogojnih zahtev (Selenium): kopija ali fetch(url) + shrani."""
+    html = lookup(url, mode)
+    if html is None:
+        html = fetch(url)
+        store(url, html)
+    return html
+
+
+class CachedResponse:
+    """Minimalen nadomestek za requests.Response, ko stran pride iz predpomnilnika."""
+
+    status_code = 200
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+
+    def raise_for_status(self) -> None:
+        pass
+
+
+def cached_get(session, url: str, timeout: float = 30, mode: str | None = None):
+    """GET prek requests/cloudscraper seje s predpomnilnikom in pogojno revalidacijo.
+
+    Vrne CachedResponse (zadetek ali 304) ali pravi odgovor seje; napake
+    (403, 5xx …) obravnava kličoči kot doslej.
+    """
+    html = lookup(url, mode)
+    if html is not None:
+        return CachedResponse(html)
+
+    meta = _read_meta(url) if (mode or MODE) != "refresh" else None
+    headers = {}
+    if meta and meta.get("etag"):
+        headers["If-None-Match"] = meta["etag"]
+    if meta and meta.get("last_modified"):
+        headers["If-Modified-Since"] = meta["last_modified"]
+
+    resp = session.get(url, timeout=timeout, headers=headers or None)
+    if resp.status_code == 304 and meta:
+        _touch(url, meta)
+        return CachedResponse(_read_body(url))
+    if resp.status_code == 200:
+        store(url, resp.text, resp.headers)
+    return resp
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Hitro iskanje tabel v FBref HTML brez razčlenjevanja celotne strani
+--------------------------------------------------------------------
+FBref veliko tabel skrije v HTML komentarje (<!-- <table id="..."> -->).
+Namesto BeautifulSoup drevesa cele strani in ponovnega razčlenjevanja vsakega
+komentarja tabelo poiščemo z regex na surovem besedilu (deluje enako za
+živi DOM in komentarje) in z lxml razčlenimo le njen izrez.
+Če hitra pot odpove, rezervna pot razčleni stran z lxml in pregleda le
+komentarje, ki vsebujejo iskani id (poceni preverjanje podniza).
+"""
+
+import re
+from functools import lru_cache
+
+import lxml.html
+from lxml import etree
+
+
+@lru_cache(maxsize=None)
+def _start_re(id_regex: str) -> re.Pattern:
+    return re.compile(r"""<table\b[^>]*\bid=["'](%s)["']""" % id_regex, re.I)
+
+
+def _id_prefix(id_regex: str) -> str:
+    """Dobesedni začetek vzorca id-ja za predfilter komentarjev (npr. 'sched_')."""
+    return re.match(r"[\w-]*", id_regex).group(0)
+
+
+def tables_html(html: str, id_regex: str) -> list[str]:
+    """Vse tabele z id-jem, ki ustreza id_regex, kot HTML-nizi v vrstnem redu na strani."""
+    out, seen = [], set()
+    for m in _start_re(id_regex).finditer(html):
+        end = html.find("</table>", m.end())
+        if end < 0 or m.group(1) in seen:
+            continue
+        seen.add(m.group(1))
+        out.append(html[m.start():end + len("</table>")])
+    return out or _tables_html_lxml(html, id_regex)
+
+
+def _tables_html_lxml(html: str, id_regex: str) -> list[str]:
+    doc = lxml.html.fromstring(html)
+    rx = re.compile(id_regex + "$")
+    found = [t for t in doc.iter("table") if rx.match(t.get("id") or "")]
+    if not found:
+        prefix = _id_prefix(id_regex)
+        for com in doc.iter(etree.Comment):
+            text = com.text or ""
+            if prefix not in text:
+                continue
+            sub = lxml.html.fromstring(text) if "<table" in text else None
+            if sub is not None:
+                found += [t for t in sub.iter("table") if rx.match(t.get("id") or "")]
+    return [lxml.html.tostring(t, encoding="unicode") for t in found]
+
+
+def table_html(html: str, id_regex: str) -> str | None:
+    tabs = tables_html(html, id_regex)
+    return tabs[0] if tabs else None
+
+
+def parse_table(table: str) -> lxml.html.HtmlElement:
+    return lxml.html.fragment_fromstring(table)
+
+
+def tfoot_stat(table: lxml.html.HtmlElement, stat: str) -> str | None:
+    """Besedilo celice <tfoot> z data-stat=stat (vsota ekipe) ali None."""
+    cells = table.xpath(f".//tfoot//td[@data-stat='{stat}']")
+    return cells[0].text_content().strip() if cells else None
+
+
+def _num(text: str | None) -> float | None:
+    text = (text or "").strip().replace(",", "")
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+
+def body_rows(table: lxml.html.HtmlElement) -> list:
+    """Podatkovne vrstice <tbody> (brez vmesnih glav in praznih ločilnih vrstic)."""
+    return [tr for tr in table.xpath(".//tbody/tr")
+            if not {"thead", "spacer", "partial_table"} & set((tr.get("class") or "").split())]
+
+
+def column_total(table: lxml.html.HtmlElement, stat: str, row_filter=None) -> float | None:
+    """Vsota stolpca data-stat=stat: iz <tfoot>, če obstaja, sicer seštevek vrstic <tbody>.
+
+    row_filter(tr) -> bool omeji vsoto na izbrane vrstice (tfoot se takrat ne uporabi).
+    """
+    if row_filter is None:
+        foot = tfoot_stat(table, stat)
+        if foot is not None:
+            return _num(foot)
+    vals = []
+    for tr in body_rows(table):
+        if row_filter is not None and not row_filter(tr):
+            continue
+        cell = tr.find(f"*[@data-stat='{stat}']")
+        if cell is not None:
+            vals.append(_num(cell.text_content()))
+    vals = [v for v in vals if v is not None]
+    return float(sum(vals)) if vals or row_filter is not None else None
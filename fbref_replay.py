@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Scraperji brez omrežja: posneti korpus strani FBref in lokalni nadomestni strežnik
+----------------------------------------------------------------------------------
+• korpus = mapa z zgradbo fbref_cache (ab/abcdef….html.gz + .json); posname se z
+  enim živim zagonom v prazno mapo (FBREF_CACHE_DIR) ali z `record` iz predpomnilnika
+• zaledje replay (FBREF_BACKEND=replay): scraperji berejo strani iz korpusa
+  (FBREF_REPLAY_DIR) – brez brskalnika, omejevalnika in predpomnilnika; stran,
+  ki je v korpusu ni, sproži Miss (nikoli prenosa)
+• nadomestni strežnik (`serve`): streže korpus po HTTP pod enakimi potmi kot FBref;
+  s FBREF_ORIGIN=http://127.0.0.1:8766 gredo zahteve Selenium / HTTP sej tja
+  (cel sklad – brskalnik, bazen sej, predpomnilnik – a brez zamikov omejevalnika)
+• hitrost razčlenjevanja na korpusu meri bench_scrape.py
+
+Uporaba:
+    FBREF_CACHE_DIR=fbref_corpus FBREF_CACHE=refresh python scrape_pl_24_25_03.py
+    python fbref_replay.py record --matches 20       # ali izrez iz .fbref_cache
+    python fbref_replay.py info
+    FBREF_BACKEND=replay python scrape_pl_24_25_03.py
+    python fbref_replay.py serve                     # v drugem terminalu:
+    FBREF_ORIGIN=http://127.0.0.1:8766 FBREF_CACHE=refresh python scrape_pl_24_25_03.py
+"""
+
+import os
+import argparse
+from pathlib import Path
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import fbref_cache
+
+BASE_URL = "https://fbref.com"
+CORPUS_DIR = Path(os.environ.get("FBREF_REPLAY_DIR", "fbref_corpus"))
+REPLAY = os.environ.get("FBREF_BACKEND") == "replay"
+ORIGIN = os.environ.get("FBREF_ORIGIN")          # npr. http://127.0.0.1:8766 (serve)
+HOST = "127.0.0.1"
+PORT = 8766
+RECORD_MATCHES = 20        # poročil tekem v izrezu (razporedi gredo vsi)
+
+
+class Miss(LookupError):
+    """Strani ni v korpusu – brez omrežja je ni mogoče dobiti."""
+
+
+def fetch(url: str, corpus: Path | None = None) -> str:
+    """HTML strani iz korpusa; namesto prenosa, ko teče zaledje replay."""
+    corpus = corpus or CORPUS_DIR
+    html = fbref_cache.read(url, corpus)
+    if html is None:
+        raise Miss(f"Strani ni v korpusu '{corpus}': {url}")
+    return html
+
+
+def local_url(url: str) -> str:
+    """URL na FBref → enaka pot na ORIGIN; brez ORIGIN nespremenjen."""
+    if ORIGIN and url.startswith(BASE_URL):
+        return ORIGIN.rstrip("/") + url[len(BASE_URL):]
+    return url
+
+
+class Redirected:
+    """Ovoj seje (requests / cloudscraper / Selenium): get() gre na ORIGIN, vse
+    ostalo (page_source, title, quit …) nespremenjeno na ovito sejo."""
+
+    def __init__(self, session) -> None:
+        self._session = session
+
+    def get(self, url: str, *args, **kwargs):
+        return self._session.get(local_url(url), *args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._session, name)
+
+
+def via_origin(session):
+    return Redirected(session) if ORIGIN else session
+
+
+# ──────────────────────────────────────────────────────────────
+def record(src: Path | None = None, dst: Path = CORPUS_DIR, matches: int = RECORD_MATCHES) -> int:
+    """Izrez predpomnilnika v korpus: vsi razporedi in prvih `matches` poročil (po URL-ju)."""
+    metas = fbref_cache.entries(src)
+    pages = [m for m in metas if m["kind"] != "match"]
+    pages += [m for m in metas if m["kind"] == "match"][:matches]
+    for m in pages:
+        fbref_cache.copy(m["url"], dst, src)
+    return len(pages)
+
+
+def info(corpus: Path = CORPUS_DIR) -> dict[str, int]:
+    kinds: dict[str, int] = {}
+    for m in fbref_cache.entries(corpus):
+        kinds[m["kind"]] = kinds.get(m["kind"], 0) + 1
+    return kinds
+
+
+class Handler(BaseHTTPRequestHandler):
+    corpus = CORPUS_DIR
+
+    def do_GET(self):
+        html = fbref_cache.read(BASE_URL + self.path, self.corpus)
+        body = (html if html is not None else f"Strani ni v korpusu: {self.path}").encode("utf-8")
+        self.send_response(200 if html is not None else 404)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, fmt, *args):
+        pass                                       # brez vrstice na zahtevo
+
+
+def serve(corpus: Path = CORPUS_DIR, host: str = HOST, port: int = PORT) -> None:
+    Handler.corpus = corpus
+    server = ThreadingHTTPServer((host, port), Handler)
+    print(f"Korpus '{corpus}' ({sum(info(corpus).values())} strani) na http://{host}:{port} "
+          "(Ctrl+C za konec).")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Posneti korpus strani FBref za delo brez omrežja.")
+    ap.add_argument("cmd", choices=("record", "info", "serve"))
+    ap.add_argument("--corpus", default=str(CORPUS_DIR))
+    ap.add_argument("--src", default=str(fbref_cache.CACHE_DIR), help="predpomnilnik za record")
+    ap.add_argument("--matches", type=int, default=RECORD_MATCHES)
+    ap.add_argument("--host", default=HOST)
+    ap.add_argument("--port", type=int, default=PORT)
+    args = ap.parse_args()
+    corpus = Path(args.corpus)
+    if args.cmd == "record":
+        n = record(Path(args.src), corpus, args.matches)
+        print(f"V korpus '{corpus}' prepisanih {n} strani iz '{args.src}'.")
+    elif args.cmd == "info":
+        kinds = info(corpus)
+        print(f"Korpus '{corpus}': " + (", ".join(f"{k}={n}" for k, n in sorted(kinds.items()))
+                                          or "prazen"))
+    else:
+        serve(corpus, args.host, args.port)
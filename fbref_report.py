@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Vse statistike ekip iz enega poročila tekme (FBref "Match Report")
+-------------------------------------------------------------------
+Ena naložena stran → vse vrednosti iz sheme scrape_pl_24_25_03.csv.
+Kaj se bere, določa deklarativni slovar REPORT_STATS (stolpec → tabela,
+data-stat, opcijski filter vrstic); nov stolpec = nova vrstica v slovarju.
+
+Tabele na strani (prva = domači, druga = gostje):
+    summary     stats_<id>_summary      (povzetek igralcev, <tfoot> = ekipa)
+    passing     stats_<id>_passing
+    possession  stats_<id>_possession
+    keeper      keeper_stats_<id>       (brez <tfoot> → seštevek vratarjev)
+    shots       shots_<id>              (posamezni streli)
+
+Izpeljani stolpci (razlika PSxG − goli, "field tilt", vrednosti nasprotnika)
+se izračunajo iz prebranih; dnevi počitka pridejo iz razporeda (rest_days).
+"""
+
+import pandas as pd
+
+import fbref_html
+
+TABLES = {
+    "summary":    r"stats_[0-9a-f]+_summary",
+    "passing":    r"stats_[0-9a-f]+_passing",
+    "possession": r"stats_[0-9a-f]+_possession",
+    "keeper":     r"keeper_stats_[0-9a-f]+",
+    "shots":      r"shots_[0-9a-f]+",
+}
+
+
+def is_set_piece(tr) -> bool:
+    """Strel po prekinitvi: prva akcija je mrtva žoga (kot, prosti strel, met) ali direkten prosti strel.
+
+    Enajstmetrovke niso vključene (te so že izločene iz npxG)."""
+    sca = tr.find("*[@data-stat='sca_1_type']")
+    notes = tr.find("*[@data-stat='notes']")
+    sca = sca.text_content() if sca is not None else ""
+    notes = notes.text_content() if notes is not None else ""
+    return "Pass (Dead)" in sca or "Free kick" in notes
+
+
+# stolpec (brez predpone home_/away_) → (tabela, data-stat, filter vrstic)
+REPORT_STATS = {
+    "npxG":           ("summary",    "npxg",                     None),
+    "SoT_for":        ("summary",    "shots_on_target",          None),
+    "crdY":           ("summary",    "cards_yellow",             None),
+    "RedCards":       ("summary",    "cards_red",                None),
+    "PenPass_for":    ("passing",    "passes_into_penalty_area", None),
+    "Touches3rd_for": ("possession", "touches_att_3rd",          None),
+    "PSxG":           ("keeper",     "gk_psxg",                  None),
+    "GA":             ("keeper",     "gk_goals_against",         None),
+    "xG_SET":         ("shots",      "xg_shot",                  is_set_piece),
+}
+
+# stolpec → stolpec nasprotnika, iz katerega se prepiše
+AGAINST = {
+    "npxGA":         "npxG",
+    "xG_SET_A":      "xG_SET",
+    "SoT_ag":        "SoT_for",
+    "PSxG_G_diff_A": "PSxG_G_diff",
+    "PenPass_ag":    "PenPass_for",
+    "Touches3rd_ag": "Touches3rd_for",
+    "OppRed":        "RedCards",
+}
+
+# vrstni red kot v scrape_pl_24_25_03.csv (+ rumeni kartoni)
+TEAM_COLS = ["npxG", "npxGA", "xG_SET", "xG_SET_A", "SoT_for", "SoT_ag",
+             "PSxG_G_diff", "PSxG_G_diff_A", "PenPass_for", "PenPass_ag",
+             "Touches3rd_for", "Touches3rd_ag", "FieldTilt", "RedCards", "OppRed", "crdY"]
+REPORT_COLS = [f"{side}_{c}" for c in TEAM_COLS for side in ("home", "away")]
+# števne statistike (v CSV kot cela števila)
+INT_COLS = [c for c in REPORT_COLS if c.split("_", 1)[1] in
+            ("SoT_for", "SoT_ag", "PenPass_for", "PenPass_ag", "Touches3rd_for", "Touches3rd_ag",
+             "RedCards", "OppRed", "crdY")]
+# iz razporeda, ne iz poročila
+SCHEDULE_DERIVED_COLS = ["home_rest_days", "away_rest_days"]
+
+
+def team_tables(html: str) -> dict[str, tuple]:
+    """{ime tabele: (domača, gostujoča)} razčlenjeni lxml elementi; manjkajoče tabele izpusti."""
+    out = {}
+    for name, id_regex in TABLES.items():
+        tabs = fbref_html.tables_html(html, id_regex)
+        if len(tabs) >= 2:
+            out[name] = tuple(fbref_html.parse_table(t) for t in tabs[:2])
+    return out
+
+
+def extract(html: str) -> dict[str, float | None]:
+    """Vse stolpce REPORT_COLS iz HTML poročila tekme.
+
+    Vrže RuntimeError, če ni niti tabel povzetka (stran ni poročilo ali je prazna).
+    """
+    tables = team_tables(html)
+    if "summary" not in tables:
+        raise RuntimeError("Na strani ni tabel s povzetkom igralcev.")
+
+    side = {"home": {}, "away": {}}
+    for col, (table, stat, row_filter) in REPORT_STATS.items():
+        pair = tables.get(table)
+        for i, s in enumerate(("home", "away")):
+            side[s][col] = fbref_html.column_total(pair[i], stat, row_filter) if pair else None
+
+    # PSxG strelov, ki jih je prejel vratar ekipe, minus prejeti goli (> 0 = vratar nad pričakovanji)
+    for s in side.values():
+        psxg, ga = s.pop("PSxG"), s.pop("GA")
+        s["PSxG_G_diff"] = round(psxg - ga, 2) if psxg is not None and ga is not None else None
+    h, a = side["home"], side["away"]
+    t_h, t_a = h["Touches3rd_for"], a["Touches3rd_for"]     # delež dotikov v zadnji tretjini
+    tilt = t_h / (t_h + t_a) if t_h is not None and t_a is not None and t_h + t_a > 0 else None
+    h["FieldTilt"], a["FieldTilt"] = ((round(tilt, 4), round(1 - tilt, 4)) if tilt is not None
+                                      else (None, None))
+    for own, opp in ((h, a), (a, h)):
+        for col, src in AGAINST.items():
+            own[col] = opp[src]
+
+    return {f"{s}_{col}": side[s][col] for col in TEAM_COLS for s in ("home", "away")}
+
+
+def rest_days(df: pd.DataFrame) -> pd.DataFrame:
+    """home_rest_days / away_rest_days: dni od prejšnje tekme ekipe v df (prva tekma → NaN)."""
+    dates = pd.to_datetime(df["date"])
+    long = pd.DataFrame({
+        "row": list(df.index) * 2,
+        "side": ["home"] * len(df) + ["away"] * len(df),
+        "team": list(df["home_team"]) + list(df["away_team"]),
+        "date": list(dates) * 2,
+    }).sort_values(["team", "date"], kind="stable")
+    long["rest"] = long.groupby("team")["date"].diff() / pd.Timedelta(days=1)
+    out = df.copy()
+    for s in ("home", "away"):
+        part = long[long["side"] == s].set_index("row")["rest"]
+        out[f"{s}_rest_days"] = part.reindex(df.index)
+    return out
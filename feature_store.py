@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Predizračunane značilke ekip: kumulativna polja (dan tekme × ekipa)
+-------------------------------------------------------------------
+Zgradi se enkrat po osvežitvi podatkov (scrape_pl_24_25_02 jo pokliče sam),
+nato je vsaka poizvedba "stanje na datum D" le rez polja:
+
+    k = matchday(fs, D)            # št. dni s tekmami pred D (binarno iskanje)
+    fs["xg"][k] - fs["xg"][j]      # vsote xG med dnevoma j in k  → O(1)
+
+Polja (vrstica 0 = pred prvo tekmo, vrstica k = po k-tem dnevu s tekmami):
+    xg     (D+1, 4, T)  xG doma, xG v gosteh, prejeti xG doma, prejeti xG v gosteh
+    n      (D+1, 2, T)  tekme doma, tekme v gosteh
+    league (D+1, 4)     št. tekem, Σ domači goli, Σ goli gostov, Σ produktov (za λ3)
+    form   (D+1, T)     povprečna razlika xG zadnjih form_n tekem ekipe
+
+Vhod so stolpci iz scrape_pl_24_25_02.build_dataframe (date, ekipi, goli, xG).
+Uporabniki: predict_tot_bha --features (form), backtest (model_asof + form).
+"""
+
+import sys, argparse, pathlib, numpy as np, pandas as pd
+
+import predict_tot_bha as ptb
+
+FEATURES_FILE = "features.npz"
+FORM_N        = 5
+
+# ──────────────────────────────────────────────────────────────
+def _cum(day, team, w, D, T):
+    """Vsota uteži w po (dan, ekipa), kumulativno po dnevih; vrstica 0 = ničle."""
+    flat = np.bincount(day * T + team, w, D * T).reshape(D, T)
+    return np.vstack([np.zeros((1, T)), np.cumsum(flat, axis=0)])
+
+def build(df, form_n=FORM_N):
+    """Značilke iz odigranih tekem df; neodigrane (brez golov) se preskočijo."""
+    df = df[df["home_goals"].notna()]
+    teams = ptb.team_index(df)
+    date = pd.to_datetime(df["date"]).to_numpy("datetime64[ns]")
+    dates = np.unique(date)
+    D, T = len(dates), len(teams)
+    d = np.searchsorted(dates, date)
+    h = teams.get_indexer(df["home_team"])
+    a = teams.get_indexer(df["away_team"])
+    hx, ax = df["home_xG"].to_numpy(float), df["away_xG"].to_numpy(float)
+    hg, ag = df["home_goals"].to_numpy(float), df["away_goals"].to_numpy(float)
+
+    stack = lambda *parts: np.stack([_cum(d, t, w, D, T) for t, w in parts], axis=1)
+    xg    = stack((h, hx), (a, ax), (h, ax), (a, hx))
+    n     = stack((h, np.ones(len(df))), (a, np.ones(len(df))))
+    one = np.zeros(len(df), dtype=int)
+    league = np.stack([_cum(d, one, w, D, 1)[:, 0]
+                       for w in (np.ones(len(df)), hg, ag, hg * ag)], axis=1)
+
+    # forma: predpone razlik xG po tekmah vsake ekipe (urejeno po datumu)
+    team = np.concatenate([h, a])
+    day = np.concatenate([d, d])
+    diff = np.concatenate([hx - ax, ax - hx])
+    order = np.lexsort((day, team))
+    G = np.concatenate([[0.0], np.cumsum(diff[order])])
+    start = np.searchsorted(team[order], np.arange(T))          # prva tekma ekipe v G
+    played = (n[:, 0] + n[:, 1]).astype(int)                    # (D+1, T)
+    m = np.minimum(played, form_n)
+    end = start + played
+    with np.errstate(invalid="ignore", divide="ignore"):
+        form = np.where(m > 0, (G[end] - G[end - m]) / m, 0.0)
+
+    return dict(teams=teams, dates=dates, xg=xg, n=n, league=league,
+                form=form, form_n=form_n)
+
+def save(fs, path=FEATURES_FILE):
+    np.savez(path, **{**fs, "teams": np.asarray(fs["teams"], dtype=str)})
+
+def load(path=FEATURES_FILE):
+    with np.load(path) as z:
+        fs = {k: z[k] for k in z.files}
+    fs["teams"] = pd.Index(fs["teams"].astype(object))
+    fs["form_n"] = int(fs["form_n"])
+    return fs
+
+# ──────────────────────────────────────────────────────────────
+def matchday(fs, date):
+    """Indeks vrstice s stanjem tik pred datumom (tekme na sam datum niso všteti)."""
+    if np.ndim(date) == 0:
+        return int(np.searchsorted(fs["dates"], np.datetime64(pd.Timestamp(date), "ns")))
+    dates = pd.to_datetime(np.asarray(date)).to_numpy("datetime64[ns]")
+    return np.searchsorted(fs["dates"], dates, side="left")
+
+def form_asof(fs, teams, dates):
+    """Forma ekip na dane datume (kot ptb.form_lookup); neznana ekipa → 0."""
+    k = matchday(fs, np.asarray(dates))
+    t = fs["teams"].get_indexer(np.asarray(teams, dtype=object))
+    return np.where(t >= 0, fs["form"][k, np.maximum(t, 0)], 0.0)
+
+def shared_from_goals(g, floor=0.01):
+    n, sh, sa, sha = g
+    return max(sha / n - (sh / n) * (sa / n), floor) if n else floor
+
+def model_asof(fs, date, since=None, ls_floor=0.01):
+    """Model (kot ptb.fit_model, brez kalibracije) iz tekem v [since, date)."""
+    hi = matchday(fs, date)
+    lo = matchday(fs, since) if since is not None else 0
+    H_att, A_att, H_def, A_def, home_avg, away_avg = ptb.tables_from_sums(
+        fs["xg"][hi] - fs["xg"][lo], fs["n"][hi] - fs["n"][lo])
+    # ekipa brez tekem doma / v gosteh → povprečje lige
+    H_att, A_att, H_def, A_def = (np.nan_to_num(x, nan=1.0)
+                                  for x in (H_att, A_att, H_def, A_def))
+    return dict(teams=fs["teams"], H_att=H_att, A_att=A_att, H_def=H_def, A_def=A_def,
+                home_avg=home_avg, away_avg=away_avg,
+                shared=shared_from_goals(fs["league"][hi] - fs["league"][lo], ls_floor))
+
+# ──────────────────────────────────────────────────────────────
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Zgradi shrambo značilk ekip.")
+    ap.add_argument("csv", nargs="?", default=ptb.CSV_DEFAULT,
+                    help="CSV ali imenik shrambe match_store")
+    ap.add_argument("--league")
+    ap.add_argument("--season")
+    ap.add_argument("--form-n", type=int, default=FORM_N)
+    ap.add_argument("--out", default=FEATURES_FILE)
+    args = ap.parse_args()
+    if not pathlib.Path(args.csv).exists():
+        sys.exit(f"CSV datoteka '{args.csv}' ne obstaja.")
+    fs = build(ptb.read_season(args.csv, args.league, args.season), args.form_n)
+    save(fs, args.out)
+    print(f"{len(fs['teams'])} ekip × {len(fs['dates'])} dni s tekmami → '{args.out}'.")
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Stolpčna shramba tekem (Parquet, particije liga/sezona) s tipizirano shemo
+---------------------------------------------------------------------------
+• data/store/league=pl/season=2024-2025/matches.parquet
+• shema: ekipe kot kategorije (dictionary), goli int8, xG float32, števci int16
+• enotna imena stolpcev (matchweek → matchweek_number)
+• load() prebere le zahtevane stolpce in particije (projekcija + filter v pyarrow)
+• read_matches() sprejme shrambo ali CSV – skripte delujejo z obojim
+
+Uvoz:
+    python match_store.py import scrape_pl_24_25_02.csv --league pl --season 2024-2025
+    python match_store.py import-catalog data        # izhod scrape_fbref_catalog.py
+    python match_store.py info
+"""
+
+import sys, argparse, pathlib, os
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+import fbref_report
+
+STORE_DIR = pathlib.Path("data/store")
+FILE_NAME = "matches.parquet"
+
+# staro ime → kanonično ime
+RENAME = {"matchweek": "matchweek_number", "Wk": "matchweek_number"}
+
+TEAM = pa.dictionary(pa.int16(), pa.string())
+_BASE = [
+    ("matchweek_number", pa.int8()),
+    ("match_id",         pa.int16()),
+    ("match_key",        pa.string()),
+    ("date",             pa.timestamp("us")),
+    ("home_team",        TEAM),
+    ("away_team",        TEAM),
+    ("home_goals",       pa.int8()),
+    ("away_goals",       pa.int8()),
+    ("home_xG",          pa.float32()),
+    ("away_xG",          pa.float32()),
+    ("home_xGA",         pa.float32()),
+    ("away_xGA",         pa.float32()),
+]
+_STATS = [(c, pa.int16() if c in fbref_report.INT_COLS else pa.float32())
+          for c in fbref_report.REPORT_COLS + fbref_report.SCHEDULE_DERIVED_COLS]
+SCHEMA = pa.schema(_BASE + _STATS)
+PARTITIONS = ("league", "season")
+
+# pandas dtype za cela števila z manjkajočimi vrednostmi (neodigrane tekme)
+_PANDAS_TYPES = {pa.int8(): pd.Int8Dtype(), pa.int16(): pd.Int16Dtype()}
+
+
+# ──────────────────────────────────────────────────────────────
+def to_table(df: pd.DataFrame) -> pa.Table:
+    """DataFrame iz katerekoli različice CSV → tabela s shemo SCHEMA (manjkajoči stolpci = null)."""
+    df = df.rename(columns=RENAME)
+    cols = {}
+    for field in SCHEMA:
+        if field.name not in df:
+            cols[field.name] = pa.nulls(len(df), field.type)
+            continue
+        s = df[field.name]
+        if field.name == "date":
+            s = pd.to_datetime(s)
+        elif pa.types.is_integer(field.type):
+            s = pd.to_numeric(s, errors="coerce").round().astype("Int64")
+        elif pa.types.is_floating(field.type):
+            s = pd.to_numeric(s, errors="coerce")
+        elif pa.types.is_dictionary(field.type):
+            s = s.astype(str)
+        cols[field.name] = pa.array(s, from_pandas=True).cast(field.type)
+    return pa.table(cols, schema=SCHEMA)
+
+
+def partition_path(league: str, season: str, root=STORE_DIR) -> pathlib.Path:
+    return pathlib.Path(root) / f"league={league}" / f"season={season}" / FILE_NAME
+
+
+def write_partition(df: pd.DataFrame, league: str, season: str, root=STORE_DIR) -> pathlib.Path:
+    """Zamenja celotno particijo (liga, sezona); zapis je atomaren."""
+    path = partition_path(league, season, root)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.parent / f".{FILE_NAME}.tmp"     # pyarrow datoteke s piko na začetku ignorira
+    pq.write_table(to_table(df), tmp, compression="zstd")
+    os.replace(tmp, path)
+    return path
+
+
+def import_csv(csv_path, league: str, season: str, root=STORE_DIR) -> pathlib.Path:
+    return write_partition(pd.read_csv(csv_path), league, season, root)
+
+
+def import_catalog(data_dir="data", root=STORE_DIR) -> list[pathlib.Path]:
+    """Uvozi vse particije data/league=*/season=*/matches.csv (scrape_fbref_catalog.py)."""
+    out = []
+    for csv in sorted(pathlib.Path(data_dir).glob("league=*/season=*/matches.csv")):
+        league = csv.parent.parent.name.split("=", 1)[1]
+        season = csv.parent.name.split("=", 1)[1]
+        out.append(import_csv(csv, league, season, root))
+    return out
+
+
+# ──────────────────────────────────────────────────────────────
+def _as_list(v):
+    return None if v is None else [v] if isinstance(v, str) else list(v)
+
+
+def load(columns=None, league=None, season=None, played=False, root=STORE_DIR) -> pd.DataFrame:
+    """Tekme iz shrambe kot DataFrame.
+
+    columns – seznam stolpcev (None = vsi); league / season – niz ali seznam
+    particij (None = vse); played=True → le tekme z rezultatom.
+    Ekipe so kategorije, goli Int8, xG float32.
+    """
+    dataset = ds.dataset(root, format="parquet", partitioning="hive")
+    flt = None
+    for name, vals in (("league", _as_list(league)), ("season", _as_list(season))):
+        if vals is not None:
+            e = ds.field(name).isin(vals)
+            flt = e if flt is None else flt & e
+    if played:
+        e = ds.field("home_goals").is_valid()
+        flt = e if flt is None else flt & e
+    table = dataset.to_table(columns=columns, filter=flt)
+    df = table.to_pandas(types_mapper=_PANDAS_TYPES.get)
+    for name in PARTITIONS:
+        if name in df:
+            df[name] = df[name].astype("category")
+    # ekipe iz različnih particij imajo lahko različne slovarje → poenoti kategorije
+    teams = [c for c in ("home_team", "away_team") if c in df]
+    if teams:
+        cats = sorted(set().union(*(df[c].cat.categories for c in teams)))
+        for c in teams:
+            df[c] = df[c].cat.set_categories(cats)
+    return df
+
+
+def read_matches(path, league=None, season=None, columns=None) -> pd.DataFrame:
+    """Tekme iz shrambe (imenik) ali CSV datoteke z enotnimi imeni stolpcev."""
+    path = pathlib.Path(path)
+    if path.is_dir():
+        return load(columns, league, season, root=path)
+    df = pd.read_csv(path).rename(columns=RENAME)
+    if "date" in df:
+        df["date"] = pd.to_datetime(df["date"])
+    return df[columns] if columns is not None else df
+
+
+def info(root=STORE_DIR) -> pd.DataFrame:
+    df = load(["league", "season", "date", "home_goals"], root=root)
+    return (df.groupby(["league", "season"], observed=True)
+              .agg(tekme=("date", "size"), odigrane=("home_goals", "count"),
+                   od=("date", "min"), do=("date", "max")))
+
+
+# ──────────────────────────────────────────────────────────────
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Parquet shramba tekem.")
+    ap.add_argument("--root", default=str(STORE_DIR))
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("import", help="uvozi CSV v particijo liga/sezona")
+    p.add_argument("csv")
+    p.add_argument("--league", required=True)
+    p.add_argument("--season", required=True)
+    p = sub.add_parser("import-catalog", help="uvozi izhod scrape_fbref_catalog.py")
+    p.add_argument("data_dir", nargs="?", default="data")
+    sub.add_parser("info", help="pregled particij")
+    args = ap.parse_args()
+
+    if args.cmd == "import":
+        if not pathlib.Path(args.csv).exists():
+            sys.exit(f"CSV datoteka '{args.csv}' ne obstaja.")
+        print(f"Zapisano: {import_csv(args.csv, args.league, args.season, args.root)}")
+    elif args.cmd == "import-catalog":
+        paths = import_catalog(args.data_dir, args.root)
+        print(f"Uvoženih {len(paths)} particij v '{args.root}'.")
+    else:
+        print(info(args.root).to_string())
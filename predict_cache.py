@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Predpomnilnik napovedi (λ-ji in trgi) za predict_tot_bha
+---------------------------------------------------------
+• ključ = sha256(parametri modela, tekma, povzetek tekem domače ekipe,
+  povzetek tekem gostujoče ekipe) → sprememba podatkov razveljavi le tekme
+  ekip, katerih tekme so se spremenile (selektivno, brez ročnega brisanja)
+• vsak zapis hrani še vhode modela za to tekmo (moči obeh ekip, ligaški
+  povprečji, λ3); ob branju se primerjajo s trenutnim modelom in zapis velja
+  le, če so povsem enaki
+• selektivnost velja le za spremembe izven oken TRAIN_MW / VALID_MW (npr. novi
+  krogi po VALID_MW): sprememba katerekoli tekme znotraj njih premakne ligaški
+  povprečji, λ3 in kalibracijo, zato razveljavi vse tekme
+• Monte Carlo napovedi (--mc) so naključne; predict_tot_bha jih shrani le z --cache-mc
+• dva nivoja: LRU v pomnilniku (LRU_SIZE zapisov) in disk
+  .predict_cache/ab/abcdef….json (kot fbref_cache)
+
+Uporaba (paketni način):
+    python predict_tot_bha.py --remaining --cache
+    python predict_cache.py info | clear
+"""
+
+import os, json, hashlib, argparse, pathlib
+from collections import OrderedDict
+import numpy as np, pandas as pd
+
+CACHE_DIR     = pathlib.Path(os.environ.get("PREDICT_CACHE_DIR", ".predict_cache"))
+CACHE_VERSION = 1          # povečaj ob spremembi izračuna napovedi
+LRU_SIZE      = 4096
+
+_lru = OrderedDict()
+_stats = {"hits": 0, "misses": 0, "stale": 0}
+
+# ──────────────────────────────────────────────────────────────
+def _sha(*parts):
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+def params_digest(params):
+    return _sha(CACHE_VERSION, params)
+
+def team_digests(played):
+    """{ekipa: povzetek vseh njenih odigranih tekem} – neodvisen od vrstnega reda vrstic."""
+    cols = [c for c in ("date", "home_team", "away_team", "home_goals", "away_goals",
+                        "home_xG", "away_xG", "matchweek_number") if c in played]
+    df = played[cols].astype({"home_team": str, "away_team": str})
+    rows = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    teams, code = np.unique(np.concatenate([df["home_team"].to_numpy(str),
+                                            df["away_team"].to_numpy(str)]), return_inverse=True)
+    h = np.concatenate([rows, rows])
+    order = np.lexsort((h, code))                   # po ekipi, znotraj ekipe po zgoščenki
+    bounds = np.searchsorted(code[order], np.arange(len(teams) + 1))
+    h = h[order]
+    return {str(t): hashlib.sha256(h[bounds[i]:bounds[i + 1]].tobytes()).hexdigest()
+            for i, t in enumerate(teams)}
+
+def model_inputs(model, homes, aways):
+    """Vhodi modela, od katerih je odvisna napoved vsake tekme (brez forme):
+    seznam vrstic [H_att, A_def, A_att, H_def, home_avg, away_avg, λ3, offset];
+    None za tekme z neznano ekipo."""
+    h = model["teams"].get_indexer(homes)
+    a = model["teams"].get_indexer(aways)
+    n = len(h)
+    X = np.column_stack([model["H_att"][h], model["A_def"][a], model["A_att"][a],
+                         model["H_def"][h]] +
+                        [np.full(n, float(model[k])) for k in ("home_avg", "away_avg", "shared")] +
+                        [np.full(n, float(model.get("offset", 0.0)))])
+    return [row if ok else None for row, ok in zip(X.tolist(), (h >= 0) & (a >= 0))]
+
+# ──────────────────────────────────────────────────────────────
+def _path(key):
+    return CACHE_DIR / key[:2] / f"{key}.json"
+
+def get(key):
+    """Zapis iz LRU ali z diska (ki se ob tem doda v LRU); None, če ga ni."""
+    if key in _lru:
+        _lru.move_to_end(key)
+        return _lru[key]
+    path = _path(key)
+    try:
+        entry = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    _remember(key, entry)
+    return entry
+
+def put(key, entry):
+    _remember(key, entry)
+    path = _path(key)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(entry), encoding="utf-8")
+    os.replace(tmp, path)
+
+def _remember(key, entry):
+    _lru[key] = entry
+    _lru.move_to_end(key)
+    while len(_lru) > LRU_SIZE:
+        _lru.popitem(last=False)
+
+# ──────────────────────────────────────────────────────────────
+def predict_cached(model, played, fixtures, params, compute):
+    """Kot predict_tot_bha.predict_fixtures, a le za tekme, ki jih ni v predpomnilniku.
+
+    compute(podmnožica fixtures) → DataFrame napovedi; rezultat je v vrstnem redu
+    fixtures in z enakimi stolpci, kot bi ga vrnil compute za vse tekme.
+    """
+    pdg = params_digest(params)
+    digests = team_digests(played)
+    dates = pd.to_datetime(fixtures["date"]).dt.strftime("%Y-%m-%d").tolist()
+    homes, aways = fixtures["home_team"].astype(str).tolist(), fixtures["away_team"].astype(str).tolist()
+    inputs = model_inputs(model, homes, aways)
+    keys, rows, miss = [], [], []
+    for i, (d, h, a, cur) in enumerate(zip(dates, homes, aways, inputs)):
+        key = _sha(pdg, d, h, a, digests.get(h), digests.get(a))
+        entry = get(key)
+        if entry is not None and cur is not None and entry["inputs"] == cur:
+            _stats["hits"] += 1
+            rows.append(entry["row"])
+        else:
+            _stats["stale" if entry is not None else "misses"] += 1
+            rows.append(None)
+            miss.append(i)
+        keys.append(key)
+
+    if miss:
+        fresh = compute(fixtures.iloc[miss])
+        cols = [c for c in fresh.columns if c not in ("date", "home_team", "away_team")]
+        for i, rec in zip(miss, fresh[cols].to_dict("records")):
+            rec = {k: (v.item() if isinstance(v, np.generic) else v) for k, v in rec.items()}
+            rows[i] = rec
+            if inputs[i] is not None:               # neznane ekipe (NaN) ne shranjujemo
+                put(keys[i], {"fixture": [dates[i], homes[i], aways[i]],
+                              "inputs": inputs[i], "row": rec})
+
+    return pd.concat([fixtures, pd.DataFrame(rows, index=fixtures.index)], axis=1)
+
+def stats():
+    return dict(_stats)
+
+# ──────────────────────────────────────────────────────────────
+def info(root=CACHE_DIR):
+    files = list(pathlib.Path(root).glob("*/*.json"))
+    return len(files), sum(f.stat().st_size for f in files)
+
+def clear(root=CACHE_DIR):
+    n = 0
+    for f in pathlib.Path(root).glob("*/*.json"):
+        f.unlink()
+        n += 1
+    _lru.clear()
+    return n
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Predpomnilnik napovedi.")
+    ap.add_argument("cmd", choices=("info", "clear"))
+    ap.add_argument("--dir", default=str(CACHE_DIR))
+    args = ap.parse_args()
+    if args.cmd == "info":
+        n, size = info(args.dir)
+        print(f"{n} napovedi, {size / 2**20:.1f} MB v '{args.dir}'.")
+    else:
+        print(f"Izbrisanih {clear(args.dir)} napovedi iz '{args.dir}'.")
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Stalna napovedna storitev: model v pomnilniku, lokalni HTTP/JSON API
+• tekme, model (predict_tot_bha.fit_model) in značilke forme (feature_store) se
+  zgradijo enkrat ob zagonu → napoved ene tekme je le nekaj numpy operacij
+• hot-reload: ob spremembi CSV / shrambe (mtime) se stanje zgradi na novo in
+  zamenja v enem koraku; med gradnjo zahteve še naprej streže staro stanje
+• HTTP na 127.0.0.1 ali Unix socket (--socket)
+
+API:
+    GET  /predict?home=Tottenham&away=Brighton[&date=2025-05-25]
+    POST /predict      {"fixtures": [{"home_team": …, "away_team": …, "date": …}, …]}
+    GET  /teams        ekipe v modelu
+    GET  /health       stanje, čas nalaganja, mtime podatkov
+
+Primeri:
+    python predict_service.py                                  # http://127.0.0.1:8765
+    python predict_service.py data/store --league pl --season 2024-2025 --port 9000
+    python predict_service.py --socket /tmp/predict.sock
+    curl 'http://127.0.0.1:8765/predict?home=Arsenal&away=Chelsea'
+"""
+
+import sys, os, json, time, signal, argparse, pathlib, threading, socketserver
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+import numpy as np, pandas as pd
+
+import predict_tot_bha as ptb
+import feature_store
+
+HOST        = "127.0.0.1"
+PORT        = 8765
+RELOAD_EVERY = 2.0         # s – kako pogosto največ preverimo mtime podatkov
+MAX_FIXTURES = 1000        # največ tekem v eni zahtevi
+
+_state = None              # trenutno stanje (dict); zamenja se v celoti ob ponovnem nalaganju
+_reload_lock = threading.Lock()
+_last_check = 0.0
+
+# ──────────────────────────────────────────────────────────────
+def data_mtime(path):
+    """Zadnja sprememba CSV datoteke ali katerekoli particije shrambe."""
+    path = pathlib.Path(path)
+    if path.is_dir():
+        return max((p.stat().st_mtime for p in path.rglob("*.parquet")), default=0.0)
+    return path.stat().st_mtime
+
+def load_state(path, league=None, season=None, engine=ptb.ENGINE, calib=ptb.CALIB_METHOD,
+               xi=0.0, form_n=feature_store.FORM_N):
+    """Vse, kar napoved potrebuje: odigrane tekme, model in značilke forme."""
+    mtime = data_mtime(path)
+    t0 = time.perf_counter()
+    played, train, valida = ptb.load_matches(path, date=None, league=league, season=season)
+    model = ptb.fit_model(train, valida, calib, engine, xi)
+    fs = feature_store.build(played, form_n)
+    state = dict(path=str(path), league=league, season=season, engine=engine, calib=calib,
+                 xi=xi, form_n=form_n, played=played, model=model, features=fs,
+                 teams=set(map(str, model["teams"])), mtime=mtime,
+                 loaded_at=time.time(), load_s=0.0, matches=len(played))
+    predict(state, [{"home_team": model["teams"][0], "away_team": model["teams"][1]}])  # ogrevanje
+    state["load_s"] = time.perf_counter() - t0
+    return state
+
+def maybe_reload(log=print):
+    """Ob spremembi podatkov zgradi novo stanje; napaka → ostane staro."""
+    global _state, _last_check
+    now = time.monotonic()
+    if now - _last_check < RELOAD_EVERY:
+        return False
+    _last_check = now
+    st = _state
+    try:
+        if data_mtime(st["path"]) == st["mtime"]:
+            return False
+    except OSError:
+        return False                               # datoteka se ravno zamenjuje
+    if not _reload_lock.acquire(blocking=False):   # druga nit že nalaga
+        return False
+    try:
+        new = load_state(st["path"], st["league"], st["season"], st["engine"],
+                         st["calib"], st["xi"], st["form_n"])
+        _state = new
+        log(f"Podatki osveženi: {new['matches']} tekem v {new['load_s']:.2f}s.")
+        return True
+    except Exception as exc:
+        log(f"[OPOZORILO] Ponovno nalaganje ni uspelo ({exc}) – ostaja prejšnji model.")
+        return False
+    finally:
+        _reload_lock.release()
+
+# ──────────────────────────────────────────────────────────────
+def fixtures_frame(items, teams):
+    """Seznam {home_team, away_team[, date]} → DataFrame; napačen vhod → ValueError."""
+    if not items:
+        raise ValueError("Ni tekem za napoved.")
+    if len(items) > MAX_FIXTURES:
+        raise ValueError(f"Največ {MAX_FIXTURES} tekem na zahtevo.")
+    if not all(isinstance(it, dict) for it in items):
+        raise ValueError("Vsaka tekma mora biti JSON objekt.")
+    home = [it.get("home_team", it.get("home")) for it in items]
+    away = [it.get("away_team", it.get("away")) for it in items]
+    if None in home or None in away:
+        raise ValueError("Vsaka tekma potrebuje home_team in away_team.")
+    if not all(isinstance(t, str) for t in home + away):
+        raise ValueError("Imeni ekip morata biti niza.")
+    same = sorted({h for h, a in zip(home, away) if h == a})
+    if same:
+        raise ValueError(f"Ekipa ne more igrati sama s sabo: {', '.join(same)}.")
+    unknown = sorted((set(home) | set(away)) - teams, key=str)
+    if unknown:
+        raise ValueError(f"Neznane ekipe: {', '.join(map(str, unknown))}.")
+    today = pd.Timestamp.today().normalize()
+    try:
+        date = pd.to_datetime([it.get("date") or today for it in items])
+    except (ValueError, TypeError) as exc:
+        raise ValueError(f"Neveljaven datum: {exc}") from None
+    return pd.DataFrame({"date": date, "home_team": home, "away_team": away})
+
+def _json_list(v):
+    """numpy polje → seznam za JSON; NaN / ±inf → None (null), ker JSON NaN ne pozna."""
+    v = np.round(v, 6)
+    ok = np.isfinite(v)
+    return v.tolist() if ok.all() else [x if f else None for x, f in zip(v.tolist(), ok)]
+
+def predict(state, items):
+    """Napovedi (isti stolpci kot predict_tot_bha.predict_fixtures) kot seznam slovarjev.
+
+    Trgi se zložijo neposredno iz numpy polj – brez gradnje DataFrame po stolpcih,
+    ki bi pri eni tekmi vzela večino časa zahteve. Nekončne vrednosti gredo v JSON kot null.
+    """
+    fixtures = fixtures_frame(items, state["teams"])
+    lam = ptb.fixture_lambdas(state["model"], state["played"], fixtures,
+                              form_n=state["form_n"], form=state["features"])
+    cols = ptb.market_columns(*lam, ptb.markets(ptb.score_matrix(*lam)))
+    cols = {"date": fixtures["date"].dt.strftime("%Y-%m-%d").tolist(),
+            "home_team": fixtures["home_team"].tolist(),
+            "away_team": fixtures["away_team"].tolist(),
+            **{k: (_json_list(v) if isinstance(v, np.ndarray) else v)
+               for k, v in cols.items()}}
+    return [dict(zip(cols, row)) for row in zip(*cols.values())]
+
+def health(state):
+    return {"status": "ok", "data": state["path"], "league": state["league"],
+            "season": state["season"], "engine": state["engine"],
+            "matches": state["matches"], "teams": len(state["teams"]),
+            "data_mtime": state["mtime"], "loaded_at": state["loaded_at"],
+            "load_s": round(state["load_s"], 3)}
+
+# ──────────────────────────────────────────────────────────────
+class Handler(BaseHTTPRequestHandler):
+    server_version = "football-predictor"
+
+    def _send(self, code, body):
+        data = json.dumps(body, ensure_ascii=False, default=float, allow_nan=False).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _route(self, items=None):
+        maybe_reload(self.log_message)
+        url = urlparse(self.path)
+        st = _state
+        t0 = time.perf_counter()
+        try:
+            if url.path == "/health":
+                return self._send(200, health(st))
+            if url.path == "/teams":
+                return self._send(200, {"teams": sorted(st["teams"])})
+            if url.path != "/predict":
+                return self._send(404, {"error": f"Neznana pot '{url.path}'."})
+            if items is None:
+                q = {k: v[0] for k, v in parse_qs(url.query).items()}
+                items = [q]
+            preds = predict(st, items)
+            self._send(200, {"predictions": preds,
+                             "ms": round((time.perf_counter() - t0) * 1000, 2)})
+        except ValueError as exc:
+            self._send(400, {"error": str(exc)})
+        except Exception as exc:
+            self._send(500, {"error": f"{type(exc).__name__}: {exc}"})
+
+    def do_GET(self):
+        self._route()
+
+    def do_POST(self):
+        try:
+            n = int(self.headers.get("Content-Length") or 0)
+            body = json.loads(self.rfile.read(n) or b"{}")
+        except (ValueError, json.JSONDecodeError) as exc:
+            return self._send(400, {"error": f"Neveljaven JSON: {exc}"})
+        items = body.get("fixtures") if isinstance(body, dict) else body
+        if not isinstance(items, list):
+            return self._send(400, {"error": "Pričakujem {\"fixtures\": [...]} ali seznam tekem."})
+        self._route(items)
+
+    def address_string(self):
+        # Unix socket nima naslova odjemalca
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, fmt, *args):
+        sys.stderr.write(f"[{time.strftime('%H:%M:%S')}] {fmt % args}\n")
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def get_request(self):
+        conn, _ = super().get_request()
+        return conn, ("unix", 0)
+
+def serve(path, league=None, season=None, engine=ptb.ENGINE, calib=ptb.CALIB_METHOD,
+          xi=0.0, host=HOST, port=PORT, socket_path=None):
+    global _state
+    _state = load_state(path, league, season, engine, calib, xi)
+    print(f"Model naložen: {_state['matches']} tekem, {len(_state['teams'])} ekip "
+          f"v {_state['load_s']:.2f}s.")
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        server = UnixHTTPServer(socket_path, Handler)
+        where = f"unix:{socket_path}"
+    else:
+        server = ThreadingHTTPServer((host, port), Handler)
+        where = f"http://{host}:{port}"
+    print(f"Napovedna storitev posluša na {where} (Ctrl+C za konec).")
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))     # kill → počisti socket
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if socket_path and os.path.exists(socket_path):
+            os.remove(socket_path)
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Napovedna storitev (HTTP/JSON).")
+    ap.add_argument("csv", nargs="?", default=ptb.CSV_DEFAULT,
+                    help="CSV ali imenik shrambe match_store")
+    ap.add_argument("--league")
+    ap.add_argument("--season")
+    ap.add_argument("--model", choices=("tables", "dc"), default=ptb.ENGINE)
+    ap.add_argument("--calib", choices=("mean", "mle"), default=ptb.CALIB_METHOD)
+    ap.add_argument("--xi", type=float, default=0.0)
+    ap.add_argument("--host", default=HOST)
+    ap.add_argument("--port", type=int, default=PORT)
+    ap.add_argument("--socket", help="Unix socket namesto TCP (npr. /tmp/predict.sock)")
+    args = ap.parse_args()
+    if not pathlib.Path(args.csv).exists():
+        sys.exit(f"CSV datoteka '{args.csv}' ne obstaja.")
+    serve(args.csv, args.league, args.season, args.model, args.calib, args.xi,
+          args.host, args.port, args.socket)
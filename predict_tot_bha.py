@@ -4,10 +4,17 @@ Napoved Tottenham – Brighton (25 May 2025)
 • xG-Poisson + home advantage + bivariantni λ3
 • Train MW 1-30 | valid MW 31-37
 • 20 % forma (zadnjih 5 tekem)
-• 100 000 simulacij
+• točna matrika izidov (bivariantni Poisson), MC le za navzkrižno preverjanje
+• paketni način (--fixtures / --matchweek / --remaining) → ena tabela napovedi
+• --profile [cpu] [mem] → časi korakov (stage_timer) v <out>.timing.json
+• --cache → napovedi paketa iz predpomnilnika (predict_cache), preračunajo se le spremenjene
 """
 
-import sys, pathlib, random, numpy as np, pandas as pd
+import sys, argparse, pathlib, random, numpy as np, pandas as pd
+
+import match_store
+import stage_timer
+from stage_timer import stage
 
 CSV_DEFAULT  = "scrape_pl_24_25_02.csv"
 MATCH_DATE   = pd.Timestamp("2025-05-25")
@@ -15,108 +22,347 @@ HOME_TEAM    = "Tottenham"
 AWAY_TEAM    = "Brighton"
 SIMS         = 100_000
 FORM_WEIGHT  = 0.20
+MAX_GOALS    = 10          # matrika izidov 0–10 × 0–10
+OUT_DEFAULT  = "predictions.csv"
+CALIB_METHOD = "mean"      # "mean" = razmerje povprečij xG | "mle" = ML na golih
+ENGINE       = "tables"    # "tables" = razmerja xG (build_tables) | "dc" = ML fitter
+OU_LINES     = (0.5, 1.5, 2.5, 3.5, 4.5)
+AH_LINES     = (-1.5, -1.0, -0.5, 0.0, 0.5, 1.0, 1.5)   # hendikep domačih
+DRAWS_FILE   = "sim_outcomes.npz"
+DRAWS_FORMAT = "npz"       # "npz" = vsi zadetki (uint8) | "hist" = le histogram izidov | "none"
+TRAIN_MW     = 30          # učni krogi 1–TRAIN_MW
+VALID_MW     = 37          # kalibracija na krogih TRAIN_MW+1 – VALID_MW
 
 # ──────────────────────────────────────────────────────────────
-def load_matches(csv_path):
-    df = pd.read_csv(csv_path, parse_dates=["date"])
-    train  = df[df["matchweek_number"] <= 30]
-    valida = df[(df["matchweek_number"] >= 31) & (df["matchweek_number"] <= 37)]
-    played = df[df["date"] < MATCH_DATE]
+def read_season(path, league=None, season=None):
+    """CSV ali shramba (match_store) – iz shrambe natanko ena liga/sezona."""
+    df = match_store.read_matches(path, league, season)
+    for part in ("league", "season"):
+        if part in df and df[part].nunique() > 1:
+            sys.exit(f"Shramba '{path}' vsebuje več vrednosti '{part}' – izberi --{part}.")
+    return df
+
+def load_matches(csv_path, date=MATCH_DATE, league=None, season=None):
+    with stage("read"):
+        df = read_season(csv_path, league, season)
+    stage_timer.count("matches", len(df))
+    df = df[df["home_goals"].notna()]          # le odigrane tekme
+    train  = df[df["matchweek_number"] <= TRAIN_MW]
+    valida = df[(df["matchweek_number"] > TRAIN_MW) & (df["matchweek_number"] <= VALID_MW)]
+    played = df[df["date"] < date] if date is not None else df
     return played, train, valida
 
-def league_avgs(df):
-    return df["home_xG"].mean(), df["away_xG"].mean()
+def load_fixtures(csv_path, matchweek=None, remaining=False, league=None, season=None):
+    """Tekme za paketno napoved: iz razporeda (krog / neodigrane) ali iz lastne datoteke."""
+    with stage("read"):
+        df = read_season(csv_path, league, season)
+    if "date" not in df:
+        df["date"] = MATCH_DATE
+    df["date"] = pd.to_datetime(df["date"])
+    if matchweek is not None:
+        df = df[df["matchweek_number"] == matchweek]
+    if remaining:
+        df = df[df["home_goals"].isna()]
+    return df[["date", "home_team", "away_team"]].reset_index(drop=True)
 
-def team_strengths(df, team):
-    h = df[df["home_team"] == team]
-    a = df[df["away_team"] == team]
-    return dict(
-        att_home = h["home_xG"].mean(),
-        att_away = a["away_xG"].mean(),
-        def_home = h["away_xG"].mean(),
-        def_away = a["home_xG"].mean(),
-    )
+def team_index(df):
+    return pd.Index(sorted(set(df["home_team"]) | set(df["away_team"])))
 
-def build_tables(train):
-    home_avg, away_avg = league_avgs(train)
-    H_att, A_att, H_def, A_def = {}, {}, {}, {}
-    for t in set(train["home_team"]).union(train["away_team"]):
-        st = team_strengths(train, t)
-        H_att[t] = st["att_home"] / home_avg
-        A_att[t] = st["att_away"] / away_avg
-        H_def[t] = st["def_home"] / away_avg
-        A_def[t] = st["def_away"] / home_avg
+def strength_sums(df, teams):
+    """Vsote xG in števci tekem po indeksu ekipe – en prehod čez tekme.
+
+    sums[0..3] = xG doma, xG v gosteh, prejeti xG doma, prejeti xG v gosteh
+    counts[0..1] = tekme doma, tekme v gosteh
+    """
+    T = len(teams)
+    h = teams.get_indexer(df["home_team"])
+    a = teams.get_indexer(df["away_team"])
+    hx = df["home_xG"].to_numpy(float)
+    ax = df["away_xG"].to_numpy(float)
+    sums = np.stack([np.bincount(h, hx, T), np.bincount(a, ax, T),
+                     np.bincount(h, ax, T), np.bincount(a, hx, T)])
+    counts = np.stack([np.bincount(h, minlength=T), np.bincount(a, minlength=T)])
+    return sums, counts
+
+def tables_from_sums(sums, counts):
+    home_avg = sums[0].sum() / counts[0].sum()
+    away_avg = sums[1].sum() / counts[1].sum()
+    with np.errstate(invalid="ignore", divide="ignore"):
+        H_att = sums[0] / counts[0] / home_avg
+        A_att = sums[1] / counts[1] / away_avg
+        H_def = sums[2] / counts[0] / away_avg
+        A_def = sums[3] / counts[1] / home_avg
     return H_att, A_att, H_def, A_def, home_avg, away_avg
 
-def form_adjust(df, team, n=5):
-    recent = df[((df["home_team"] == team) | (df["away_team"] == team)) &
-                (df["date"] < MATCH_DATE)].sort_values("date").tail(n)
-    if recent.empty:
-        return 0.0
-    diff = recent.apply(
-        lambda r: r["home_xG"] - r["away_xG"] if r["home_team"] == team
-        else r["away_xG"] - r["home_xG"], axis=1)
-    return diff.mean()
-
-def shared_lambda(df):
+def build_tables(train):
+    """Tabele moči kot poravnana polja; teams[i] je ekipa v vrstici i."""
+    teams = team_index(train)
+    return (teams, *tables_from_sums(*strength_sums(train, teams)))
+
+def form_table(df, n=5):
+    """Pogled ekipa–tekma: ena vrstica na ekipo na tekmo, z drsečo formo
+    (povprečna razlika xG zadnjih n tekem, vključno s to tekmo)."""
+    long = pd.concat([
+        pd.DataFrame({"team": df["home_team"], "date": df["date"],
+                      "xg_diff": df["home_xG"] - df["away_xG"]}),
+        pd.DataFrame({"team": df["away_team"], "date": df["date"],
+                      "xg_diff": df["away_xG"] - df["home_xG"]}),
+    ], ignore_index=True)
+    long["date"] = long["date"].astype("datetime64[ns]")
+    long["team"] = long["team"].astype(str)         # kategorije iz match_store → nizi za merge_asof
+    long = long.sort_values(["team", "date"], ignore_index=True)
+    long["form"] = (long.groupby("team")["xg_diff"]
+                        .rolling(n, min_periods=1).mean()
+                        .reset_index(level=0, drop=True))
+    return long.sort_values("date", ignore_index=True)
+
+def form_lookup(ft, teams, dates):
+    """Forma ekip na dane datume (le tekme pred datumom); brez tekem → 0."""
+    q = pd.DataFrame({"team": np.asarray(teams, dtype=object),
+                      "date": pd.to_datetime(np.asarray(dates)).astype("datetime64[ns]")})
+    q["_i"] = np.arange(len(q))
+    hit = pd.merge_asof(q.sort_values("date"), ft[["date", "team", "form"]],
+                        on="date", by="team", allow_exact_matches=False)
+    return hit.sort_values("_i")["form"].fillna(0.0).to_numpy()
+
+def form_adjust(df, team, n=5, date=MATCH_DATE):
+    return form_lookup(form_table(df, n), [team], [date])[0]
+
+def shared_lambda(df, floor=0.01):
     cov = np.cov(df["home_goals"], df["away_goals"], ddof=0)[0, 1]
-    return max(cov, 0.01)
-
-def calibrate_scaling(val_df, H_att, A_att, H_def, A_def, home_avg, away_avg):
-    p_h, p_a, o_h, o_a = [], [], [], []
-    for _, r in val_df.iterrows():
-        h, a = r["home_team"], r["away_team"]
-        lam_h = home_avg * H_att[h] * A_def[a]
-        lam_a = away_avg * A_att[a] * H_def[h]
-        p_h.append(lam_h); p_a.append(lam_a)
-        o_h.append(r["home_xG"]); o_a.append(r["away_xG"])
-    scale_h = np.mean(o_h) / np.mean(p_h) if p_h else 1.0
-    scale_a = np.mean(o_a) / np.mean(p_a) if p_a else 1.0
-    return scale_h, scale_a
+    return max(cov, floor)
+
+def calibrate_scaling(val_df, teams, H_att, A_att, H_def, A_def, home_avg, away_avg,
+                      method=CALIB_METHOD):
+    h = teams.get_indexer(val_df["home_team"])
+    a = teams.get_indexer(val_df["away_team"])
+    known = (h >= 0) & (a >= 0)
+    h, a = h[known], a[known]
+    p_h = home_avg * H_att[h] * A_def[a]
+    p_a = away_avg * A_att[a] * H_def[h]
+    if not len(p_h):
+        return 1.0, 1.0
+    if method == "mle":
+        # Poisson ML za λ = s·p: d/ds Σ (g·log(s·p) − s·p) = 0 → s = Σ g / Σ p
+        o_h = val_df["home_goals"].to_numpy(float)[known]
+        o_a = val_df["away_goals"].to_numpy(float)[known]
+        return o_h.sum() / p_h.sum(), o_a.sum() / p_a.sum()
+    o_h = val_df["home_xG"].to_numpy(float)[known]
+    o_a = val_df["away_xG"].to_numpy(float)[known]
+    return o_h.mean() / p_h.mean(), o_a.mean() / p_a.mean()
 
 def simulate(lh, la, ls, sims=SIMS, rng=None):
+    """Skalarji → (sims,), polja n tekem → (n, sims)."""
     rng = rng or np.random.default_rng()
-    ls = min(ls, lh * 0.9, la * 0.9)
-    S = rng.poisson(ls, sims)
-    H = rng.poisson(lh - ls, sims) + S
-    A = rng.poisson(la - ls, sims) + S
+    lh, la, ls = (np.asarray(x, dtype=float)[..., None] for x in (lh, la, ls))
+    ls = np.minimum(ls, np.minimum(lh, la) * 0.9)
+    size = np.broadcast_shapes(lh.shape, la.shape, ls.shape)[:-1] + (sims,)
+    stage_timer.count("draws", int(np.prod(size)))
+    S = rng.poisson(ls, size)
+    H = rng.poisson(lh - ls, size) + S
+    A = rng.poisson(la - ls, size) + S
     return H, A
 
+def score_hist(H, A):
+    """Histogram izidov iz simulacij: (..., sims) → (..., K, K) števcev, K = največ golov + 1."""
+    K = int(max(H.max(), A.max())) + 1
+    rows = np.arange(H[..., 0].size).reshape(H.shape[:-1])[..., None]
+    idx = (rows * K + H) * K + A
+    cnt = np.bincount(idx.ravel(), minlength=H[..., 0].size * K * K)
+    return cnt.reshape(*H.shape[:-1], K, K)
+
+def save_draws(path, H, A, fmt=DRAWS_FORMAT, keys=None):
+    """Simulacije v stisnjen .npz namesto CSV.
+
+    fmt="npz"  → home/away kot uint8 (…, sims)
+    fmt="hist" → le histogram izidov; velikost ni odvisna od števila simulacij
+    keys       → dodatna polja s ključem tekme (date, home_team, away_team) pri paketih
+    """
+    if fmt == "none":
+        return
+    extra = {k: np.asarray(v, dtype=str) for k, v in (keys or {}).items()}
+    if fmt == "hist":
+        np.savez_compressed(path, hist=score_hist(H, A).astype(np.uint32),
+                            sims=H.shape[-1], **extra)
+    else:
+        np.savez_compressed(path, home=H.astype(np.uint8), away=A.astype(np.uint8), **extra)
+
 # ──────────────────────────────────────────────────────────────
-def main(csv):
-    played, train, valida = load_matches(csv)
-    H_att, A_att, H_def, A_def, home_avg, away_avg = build_tables(train)
-
-    # kalibracija
-    sH, sA = calibrate_scaling(valida, H_att, A_att, H_def, A_def,
-                               home_avg, away_avg)
-    home_avg *= sH
-    away_avg *= sA
-
-    # forma
-    form_tot = form_adjust(played, HOME_TEAM)
-    form_bha = form_adjust(played, AWAY_TEAM)
-    f_tot = 1 + FORM_WEIGHT * form_tot / home_avg
-    f_bha = 1 + FORM_WEIGHT * (-form_bha) / away_avg
-
-    # λ-ji
-    λ_home = home_avg * H_att[HOME_TEAM] * A_def[AWAY_TEAM] * f_tot
-    λ_away = away_avg * A_att[AWAY_TEAM] * H_def[HOME_TEAM] * f_bha
-    λ_shared = shared_lambda(train)
-
-    H, A = simulate(λ_home, λ_away, λ_shared)
-
-    # statistika
-    pH, pX, pA = np.mean(H > A), np.mean(H == A), np.mean(H < A)
-    btts  = np.mean((H > 0) & (A > 0))
-    over25 = np.mean((H + A) > 2.5)
-
-    # --- POPRAVLJEN del: top 5 rezultatov -----------------------
-    uniq, cnt = np.unique(list(zip(H, A)), axis=0, return_counts=True)
-    pairs = [tuple(u) for u in uniq]               # ndarray → tuple
-    top5 = sorted(zip(cnt / len(H), pairs),
-                  key=lambda t: t[0], reverse=True)[:5]
-    # ------------------------------------------------------------
+# točen izračun: matrika verjetnosti izidov (skalarji ali polja tekem)
+def poisson_pmf(lam, max_goals=MAX_GOALS):
+    k = np.arange(1, max_goals + 1)
+    lam = np.asarray(lam, dtype=float)[..., None]
+    pmf = np.concatenate([np.ones_like(lam), np.cumprod(lam / k, axis=-1)], axis=-1)
+    return pmf * np.exp(-lam)
+
+def score_matrix(lh, la, ls, max_goals=MAX_GOALS):
+    """P[..., i, j] = P(H=i, A=j) za H = X1+X3, A = X2+X3 (enak model kot simulate)."""
+    lh, la, ls = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (lh, la, ls)))
+    ls = np.minimum(ls, np.minimum(lh, la) * 0.9)
+    p1 = poisson_pmf(lh - ls, max_goals)
+    p2 = poisson_pmf(la - ls, max_goals)
+    p3 = poisson_pmf(ls, max_goals)
+    base = p1[..., :, None] * p2[..., None, :]
+    P = np.zeros_like(base)
+    K = max_goals + 1
+    for k in range(K):                       # skupni goli premaknejo diagonalno
+        P[..., k:, k:] += p3[..., k, None, None] * base[..., :K - k, :K - k]
+    return P
+
+def markets(P, top=5):
+    """Vsi trgi iz ene mreže izidov P[..., i, j] (točna matrika ali histogram simulacij)."""
+    K = P.shape[-1]
+    i, j = np.indices(P.shape[-2:])
+    flat = P.reshape(*P.shape[:-2], -1)
+    best = np.argsort(-flat, axis=-1, kind="stable")[..., :top]
+    # porazdelitev razlike golov d = i − j (diagonale mreže)
+    d = np.arange(-(K - 1), K)
+    gd = np.stack([np.diagonal(P, offset=-k, axis1=-2, axis2=-1).sum(-1) for k in d], axis=-1)
+    ah = np.asarray(AH_LINES)[:, None] + d
+    tot = (i + j)[..., None] > np.asarray(OU_LINES)
+    return dict(
+        pH     = P[..., i > j].sum(-1),
+        pX     = P[..., i == j].sum(-1),
+        pA     = P[..., i < j].sum(-1),
+        btts   = P[..., 1:, 1:].sum((-2, -1)),
+        over25 = P[..., (i + j) > 2.5].sum(-1),
+        over   = np.einsum("...ij,ijl->...l", P, tot),       # po OU_LINES
+        ah_win  = gd @ (ah > 0).T,                           # po AH_LINES
+        ah_push = gd @ (ah == 0).T,
+        top_p  = np.take_along_axis(flat, best, axis=-1),
+        top_h  = best // K,
+        top_a  = best % K,
+        cs     = P,                                          # točen rezultat
+    )
+
+def mc_markets(H, A, top=5):
+    return markets(score_hist(H, A) / H.shape[-1], top)
+
+# ──────────────────────────────────────────────────────────────
+def fit_model(train, valida, calib=CALIB_METHOD, engine=ENGINE, xi=0.0):
+    """Tabele moči, kalibracija in λ3 – enkrat za poljubno število tekem."""
+    if engine == "dc":                       # ML na golih; train + valid skupaj
+        import dixon_coles
+        with stage("dixon_coles"):
+            return dixon_coles.to_model(dixon_coles.fit(pd.concat([train, valida]), xi=xi))
+    with stage("build_tables"):
+        teams, H_att, A_att, H_def, A_def, home_avg, away_avg = build_tables(train)
+    with stage("calibrate_scaling"):
+        sH, sA = calibrate_scaling(valida, teams, H_att, A_att, H_def, A_def,
+                                   home_avg, away_avg, calib)
+    return dict(teams=teams, H_att=H_att, A_att=A_att, H_def=H_def, A_def=A_def,
+                home_avg=home_avg * sH, away_avg=away_avg * sA,
+                shared=shared_lambda(train))
+
+def fixture_lambdas(model, played, fixtures, form_weight=FORM_WEIGHT, form_n=5, form=None):
+    """λ_home, λ_away, λ_shared za vse tekme naenkrat (forma na datum tekme).
+    form = vnaprej zgrajen form_table(played, form_n) ali shramba značilk
+    (feature_store), če ju kličoči že ima."""
+    home, away = fixtures["home_team"], fixtures["away_team"]
+    stage_timer.count("fixtures", len(fixtures))
+    with stage("form"):
+        if isinstance(form, dict):           # feature_store: rez polja po datumu
+            import feature_store
+            if form["form_n"] != form_n:
+                raise ValueError(f"Shramba značilk ima formo zadnjih {form['form_n']} tekem, ne {form_n}.")
+            f_home = feature_store.form_asof(form, home, fixtures["date"])
+            f_away = feature_store.form_asof(form, away, fixtures["date"])
+        else:
+            ft = form if form is not None else form_table(played, form_n)
+            f_home = form_lookup(ft, home, fixtures["date"])
+            f_away = form_lookup(ft, away, fixtures["date"])
+
+    home_avg, away_avg = model["home_avg"], model["away_avg"]
+    h = model["teams"].get_indexer(home)
+    a = model["teams"].get_indexer(away)
+    pick = lambda arr, idx: np.where(idx >= 0, arr[idx], np.nan)   # neznana ekipa → NaN
+    off = model.get("offset", 0.0)          # λ3 pri ML fitterju
+    lam_h = (home_avg * pick(model["H_att"], h) * pick(model["A_def"], a)
+             * (1 + form_weight * f_home / home_avg)) + off
+    lam_a = (away_avg * pick(model["A_att"], a) * pick(model["H_def"], h)
+             * (1 + form_weight * (-f_away) / away_avg)) + off
+    return lam_h, lam_a, np.full(len(fixtures), model["shared"])
+
+def predict_fixtures(model, played, fixtures, mc=False, draws_fmt=DRAWS_FORMAT,
+                     draws_path=DRAWS_FILE, form=None):
+    with stage("fixture_lambdas"):
+        lam_h, lam_a, lam_s = fixture_lambdas(model, played, fixtures, form=form)
+    if mc:
+        with stage("simulate"):
+            H, A = simulate(lam_h, lam_a, lam_s)
+        with stage("markets"):
+            m = mc_markets(H, A)
+        with stage("save_draws"):
+            save_draws(draws_path, H, A, draws_fmt,
+                       keys={"date": fixtures["date"].dt.strftime("%Y-%m-%d"),
+                             "home_team": fixtures["home_team"],
+                             "away_team": fixtures["away_team"]})
+    else:
+        with stage("score_matrix"):
+            P = score_matrix(lam_h, lam_a, lam_s)
+        with stage("markets"):
+            m = markets(P)
+    out = fixtures.copy()
+    for k, v in market_columns(lam_h, lam_a, lam_s, m).items():
+        out[k] = v
+    return out
+
+def market_columns(lam_h, lam_a, lam_s, m):
+    """Stolpci tabele napovedi (λ-ji in trgi) kot {ime: polje} v vrstnem redu izpisa."""
+    cols = {"lambda_home": lam_h, "lambda_away": lam_a, "lambda_shared": lam_s}
+    for k in ("pH", "pX", "pA", "btts"):
+        cols[k] = m[k]
+    for line, p in zip(OU_LINES, np.moveaxis(m["over"], -1, 0)):
+        cols[f"over{round(line * 10):02d}"] = p               # over05 … over45
+    for line, win, push in zip(AH_LINES, np.moveaxis(m["ah_win"], -1, 0),
+                               np.moveaxis(m["ah_push"], -1, 0)):
+        cols[f"ah{line:+g}"] = win
+        if line == int(line):
+            cols[f"ah{line:+g}_push"] = push
+    cols["top_score"] = [f"{h}-{a}" for h, a in zip(m["top_h"][:, 0], m["top_a"][:, 0])]
+    cols["top_p"] = m["top_p"][:, 0]
+    return cols
+
+def load_features(path, form_n=5):
+    """Shramba značilk (feature_store.py) ali None → forma iz surovih tekem."""
+    if path is None:
+        return None
+    import feature_store
+    fs = feature_store.load(path)
+    if fs["form_n"] != form_n:
+        sys.exit(f"Shramba značilk '{path}' ima formo zadnjih {fs['form_n']} tekem, "
+                 f"napovedovalnik pa {form_n} – zgradi jo z --form-n {form_n}.")
+    return fs
+
+# ──────────────────────────────────────────────────────────────
+def main(csv, mc=False, calib=CALIB_METHOD, engine=ENGINE, xi=0.0,
+         draws_fmt=DRAWS_FORMAT, league=None, season=None, features=None):
+    with stage("load_matches"):
+        played, train, valida = load_matches(csv, league=league, season=season)
+    with stage("fit_model"):
+        model = fit_model(train, valida, calib, engine, xi)
+    with stage("load_features"):
+        form = load_features(features)
+
+    # λ-ji (forma na MATCH_DATE)
+    fixture = pd.DataFrame({"date": [MATCH_DATE], "home_team": [HOME_TEAM],
+                            "away_team": [AWAY_TEAM]})
+    with stage("fixture_lambdas"):
+        (λ_home,), (λ_away,), (λ_shared,) = fixture_lambdas(model, played, fixture, form=form)
+
+    if mc:                                   # navzkrižno preverjanje
+        with stage("simulate"):
+            H, A = simulate(λ_home, λ_away, λ_shared)
+        with stage("markets"):
+            m = mc_markets(H, A)
+    else:
+        with stage("score_matrix"):
+            P = score_matrix(λ_home, λ_away, λ_shared)
+        with stage("markets"):
+            m = markets(P)
+    pH, pX, pA = m["pH"], m["pX"], m["pA"]
+    btts, over25 = m["btts"], m["over25"]
+    top5 = zip(m["top_p"], m["top_h"], m["top_a"])
 
     print("\n=== Tottenham – Brighton, 25 May 2025 ===")
     print(f"λ_home={λ_home:.2f}, λ_away={λ_away:.2f}, λ_shared={λ_shared:.2f}")
@@ -126,16 +372,99 @@ def main(csv):
     print(f"\n  BTTS          : {btts:6.2%}")
     print(f"  Over 2.5 gola : {over25:6.2%}\n")
     print("  Top 5 izidov:")
-    for p, (h, a) in top5:
+    for p, h, a in top5:
         print(f"    {h}-{a}: {p:6.2%}")
 
     # shrani simulacije
-    pd.DataFrame({"home": H, "away": A}).to_csv("sim_outcomes.csv", index=False)
+    if mc:
+        with stage("save_draws"):
+            save_draws(DRAWS_FILE, H, A, draws_fmt)
+
+def main_batch(csv, fixtures_csv=None, matchweek=None, remaining=False,
+               out=OUT_DEFAULT, calib=CALIB_METHOD, engine=ENGINE, xi=0.0,
+               mc=False, draws_fmt=DRAWS_FORMAT, league=None, season=None, features=None,
+               cache=False, cache_mc=False):
+    with stage("load_matches"):
+        played, train, valida = load_matches(csv, date=None, league=league, season=season)
+    with stage("fit_model"):
+        model = fit_model(train, valida, calib, engine, xi)
+    with stage("load_fixtures"):
+        fixtures = load_fixtures(fixtures_csv or csv, matchweek, remaining, league, season)
+    if fixtures.empty:
+        sys.exit("Ni tekem za napoved.")
+    with stage("load_features"):
+        form = load_features(features)
+    if cache and mc and not cache_mc:
+        print("Monte Carlo napovedi so naključne – predpomnilnik izklopljen (--cache-mc ga vklopi).")
+        cache = False
+    with stage("predict_fixtures"):
+        if cache:
+            import predict_cache
+            params = dict(calib=calib, engine=engine, xi=xi, mc=mc, sims=SIMS,
+                          form_weight=FORM_WEIGHT, form_n=5, max_goals=MAX_GOALS,
+                          train_mw=TRAIN_MW, valid_mw=VALID_MW, ou=OU_LINES, ah=AH_LINES,
+                          league=league, season=season, features=features and
+                          [features, pathlib.Path(features).stat().st_mtime])
+            res = predict_cache.predict_cached(
+                model, played, fixtures, params,
+                lambda fx: predict_fixtures(model, played, fx, mc, draws_fmt, form=form))
+            st = predict_cache.stats()
+            print(f"Predpomnilnik: {st['hits']} zadetkov, {st['misses']} novih, "
+                  f"{st['stale']} zastarelih.")
+        else:
+            res = predict_fixtures(model, played, fixtures, mc, draws_fmt, form=form)
+    with stage("write_csv"):
+        res.to_csv(out, index=False, float_format="%.4f")
+    print(f"Napovedi za {len(res)} tekem shranjene v '{out}'.")
 
 # ──────────────────────────────────────────────────────────────
 if __name__ == "__main__":
-    csv = sys.argv[1] if len(sys.argv) > 1 else CSV_DEFAULT
-    if not pathlib.Path(csv).exists():
-        sys.exit(f"CSV datoteka '{csv}' ne obstaja.")
+    ap = argparse.ArgumentParser()
+    ap.add_argument("csv", nargs="?", default=CSV_DEFAULT,
+                    help="CSV ali imenik shrambe match_store (npr. data/store)")
+    ap.add_argument("--league", help="liga v shrambi (npr. pl)")
+    ap.add_argument("--season", help="sezona v shrambi (npr. 2024-2025)")
+    ap.add_argument("--mc", action="store_true",
+                    help=f"Monte Carlo ({SIMS} simulacij) namesto točne matrike")
+    ap.add_argument("--draws", choices=("npz", "hist", "none"), default=DRAWS_FORMAT,
+                    help=f"shranjevanje simulacij (--mc) v '{DRAWS_FILE}'")
+    ap.add_argument("--calib", choices=("mean", "mle"), default=CALIB_METHOD,
+                    help="kalibracija lestvic: razmerje povprečij xG ali ML na golih")
+    ap.add_argument("--model", choices=("tables", "dc"), default=ENGINE,
+                    help="moči iz razmerij xG ali ML fitter (dixon_coles.py)")
+    ap.add_argument("--xi", type=float, default=0.0, help="časovno pojemanje (--model dc)")
+    ap.add_argument("--fixtures", help="CSV s stolpci home_team, away_team[, date]")
+    ap.add_argument("--matchweek", type=int, help="vse tekme izbranega kroga")
+    ap.add_argument("--remaining", action="store_true",
+                    help="vse neodigrane tekme iz razporeda (CSV iz scrape_pl_24_25_02.py "
+                         "ali --fixtures z razporedom)")
+    ap.add_argument("--out", default=OUT_DEFAULT)
+    ap.add_argument("--features", help="shramba značilk (feature_store.py) za formo")
+    ap.add_argument("--cache", action="store_true",
+                    help="paketni način: napovedi iz predpomnilnika predict_cache "
+                         "(le točna matrika; --mc ga obide)")
+    ap.add_argument("--cache-mc", action="store_true",
+                    help="z --cache predpomni tudi --mc napovedi (ponovno uporabi naključne rezultate; "
+                         "simulacije se shranijo le za preračunane tekme)")
+    ap.add_argument("--profile", nargs="*", choices=("cpu", "mem"), metavar="{cpu,mem}",
+                    help="časi korakov v <out>.timing.json; cpu = cProfile, mem = tracemalloc")
+    args = ap.parse_args()
+    if not pathlib.Path(args.csv).exists():
+        sys.exit(f"CSV datoteka '{args.csv}' ne obstaja.")
     random.seed(42); np.random.seed(42)
-    main(csv)
+    if args.profile is not None:
+        stage_timer.enable(cpu="cpu" in args.profile, mem="mem" in args.profile)
+    if args.fixtures or args.matchweek is not None or args.remaining:
+        main_batch(args.csv, args.fixtures, args.matchweek, args.remaining, args.out,
+                   calib=args.calib, engine=args.model, xi=args.xi,
+                   mc=args.mc, draws_fmt=args.draws, league=args.league, season=args.season,
+                   features=args.features, cache=args.cache, cache_mc=args.cache_mc)
+    else:
+        main(args.csv, mc=args.mc, calib=args.calib, engine=args.model, xi=args.xi,
+             draws_fmt=args.draws, league=args.league, season=args.season,
+             features=args.features)
+    if args.profile is not None:
+        timing = pathlib.Path(args.out).with_suffix(".timing.json")
+        rep = stage_timer.report(timing, argv=sys.argv[1:])
+        print("\n" + stage_timer.format_report(rep))
+        print(f"Časi korakov shranjeni v '{timing}'.")
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Scrape več lig in sezon s FBref po katalogu (competition id × sezona)
+======================================================================
+
+Za vsak par (liga, sezona) iz kataloga pokliče scrape_pl_24_25_03.scrape_schedule
+na razporedu te sezone. Vse zahteve gredo skozi isti bazen sej, omejevalnik
+hitrosti in predpomnilnik (.fbref_cache), zato več lig ne pomeni hitrejšega
+trkanja na FBref – le daljše delo.
+
+Izhod je razdeljen po ligi in sezoni (Hive slog, stolpca league/season sta v poti):
+    data/league=pl/season=2023-2024/matches.csv
+    data/league=pl/season=2023-2024/matches.journal.jsonl   (le med delom)
+
+Vsaka particija je samostojna: inkrementalno posodabljanje in nadaljevanje po
+prekinitvi delujeta enako kot v scrape_pl_24_25_03.
+
+Telemetrija celotnega zagona (vse lige skupaj) gre v data/scrape_telemetry.jsonl
+in data/scrape_metrics.prom, povzetek se izpiše ob koncu.
+
+Primeri:
+    python scrape_fbref_catalog.py                                  # vse lige, SEASONS
+    python scrape_fbref_catalog.py --comp 9 12 --season 2023-2024 2024-2025
+    python scrape_fbref_catalog.py --limit 3                        # hiter preizkus
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+import scrape_pl_24_25_03 as fb
+import scrape_telemetry
+
+# competition id → (kratka oznaka za particijo, ime v URL-ju FBref)
+CATALOG = {
+    9:  ("pl",           "Premier-League"),
+    12: ("laliga",       "La-Liga"),
+    11: ("seriea",       "Serie-A"),
+    20: ("bundesliga",   "Bundesliga"),
+    13: ("ligue1",       "Ligue-1"),
+    10: ("championship", "Championship"),
+}
+SEASONS = ["2022-2023", "2023-2024", "2024-2025"]
+OUT_DIR = "data"
+
+
+def schedule_url(comp: int, season: str) -> str:
+    name = CATALOG[comp][1]
+    return f"{fb.BASE_URL}/en/comps/{comp}/{season}/schedule/{season}-{name}-Scores-and-Fixtures"
+
+
+def partition_dir(out_dir: str | Path, comp: int, season: str) -> Path:
+    return Path(out_dir) / f"league={CATALOG[comp][0]}" / f"season={season}"
+
+
+def jobs(comps: list[int], seasons: list[str]) -> list[tuple[int, str]]:
+    """Vsi pari (liga, sezona); najprej starejše sezone, ki se ne spreminjajo več."""
+    unknown = [c for c in comps if c not in CATALOG]
+    if unknown:
+        raise ValueError(f"Neznane lige v katalogu: {unknown} (na voljo: {sorted(CATALOG)})")
+    return [(c, s) for s in sorted(seasons) for c in comps]
+
+
+def run(comps: list[int], seasons: list[str], out_dir: str = OUT_DIR,
+        limit: int | None = None) -> dict[tuple[int, str], int]:
+    """Obdela vse pare; vrne {(liga, sezona): št. tekem v particiji}. Napaka ene particije ne ustavi ostalih."""
+    done, failed = {}, []
+    todo = jobs(comps, seasons)
+    for i, (comp, season) in enumerate(todo, 1):
+        part = partition_dir(out_dir, comp, season)
+        part.mkdir(parents=True, exist_ok=True)
+        fb.eprint(f"\n=== [{i}/{len(todo)}] {CATALOG[comp][0]} {season} → {part} ===")
+        try:
+            df = fb.scrape_schedule(schedule_url(comp, season),
+                                    out_file=str(part / "matches.csv"),
+                                    checkpoint_file=str(part / "matches.journal.jsonl"),
+                                    limit=limit)
+            done[(comp, season)] = len(df)
+        except Exception as exc:
+            fb.eprint(f"[NAPAKA] {CATALOG[comp][0]} {season}: {exc}")
+            failed.append((comp, season))
+    if failed:
+        fb.eprint(f"\n[OPOZORILO] Neuspešne particije: {failed} – ponovni zagon nadaljuje iz dnevnikov.")
+    return done
+
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser(description="Scrape FBref po katalogu lig in sezon.")
+    ap.add_argument("--comp", type=int, nargs="+", default=list(CATALOG),
+                    help=f"FBref competition id-ji (privzeto vsi: {sorted(CATALOG)})")
+    ap.add_argument("--season", nargs="+", default=SEASONS, help="sezone v obliki 2024-2025")
+    ap.add_argument("--out-dir", default=OUT_DIR, help="koren particioniranega izhoda")
+    ap.add_argument("--limit", type=int, default=None, help="največ tekem na particijo (za preizkus)")
+    args = ap.parse_args(argv)
+    out_dir = Path(args.out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    scrape_telemetry.start(str(out_dir / scrape_telemetry.TELEMETRY_FILE))
+    try:
+        done = run(args.comp, args.season, args.out_dir, args.limit)
+    finally:
+        fb.eprint("Zapiram brskalnike...")
+        fb._pool.close()
+        fb.eprint("\n" + scrape_telemetry.finish(str(out_dir / scrape_telemetry.METRICS_FILE)))
+    fb.eprint(f"\n[KONČANO] {len(done)} particij, skupaj {sum(done.values())} tekem v '{args.out_dir}'.")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as exc:
+        fb.eprint(f"\n[KRITIČNA NAPAKA] Med izvajanjem je prišlo do napake: {exc}")
+        sys.exit(1)
@@ -5,12 +5,13 @@ Scrape FBref Premier-League Scores & Fixtures 2024-2025 + xG
 Ustvari CSV: premier_league_2024_2025_scores_xg.csv
 """
 
-import re
 import sys
 import pandas as pd
-from bs4 import BeautifulSoup, Comment
 import cloudscraper
 
+import fbref_cache
+import fbref_html
+
 URL = "https://fbref.com/en/comps/9/schedule/Premier-League-Scores-and-Fixtures"
 
 HEADERS = {
@@ -24,10 +25,10 @@ HEADERS = {
 
 
 def fetch_html(url: str) -> str:
-    """Obide Cloudflare in vrne HTML."""
+    """Obide Cloudflare in vrne HTML (iz predpomnilnika, če je na voljo)."""
     scraper = cloudscraper.create_scraper()
     scraper.headers.update(HEADERS)
-    resp = scraper.get(url, timeout=30)
+    resp = fbref_cache.cached_get(scraper, url, timeout=30)
     if resp.status_code == 403:
         raise RuntimeError(
             "Še vedno 403 – tudi cloudscraper ni uspel. "
@@ -39,19 +40,9 @@ def fetch_html(url: str) -> str:
 
 def pick_table_from_html(html: str) -> str:
     """Vrne <table> kot HTML-niz, ne glede na to, ali je v DOM-u ali v komentarju."""
-    soup = BeautifulSoup(html, "lxml")
-
-    # --- 1) Poskusi najti v živem DOM-u ----------------------------
-    direct = soup.find("table", id=re.compile(r"^sched_"))
-    if direct:
-        return str(direct)
-
-    # --- 2) Skeniraj komentarje -----------------------------------
-    for com in soup.find_all(string=lambda s: isinstance(s, Comment)):
-        sub = BeautifulSoup(com, "lxml")
-        tab = sub.find("table", id=re.compile(r"^sched_"))
-        if tab:
-            return str(tab)
+    tab = fbref_html.table_html(html, r"sched_[^\"']*")
+    if tab:
+        return tab
 
     raise RuntimeError("Tabela ni bila najdena (niti v DOM-u niti v komentarjih).")
 
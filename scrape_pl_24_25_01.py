@@ -8,13 +8,14 @@ Stolpci:
   home_xG, away_xG, home_xGA, away_xGA
 """
 
-import re
 import sys
 from io import StringIO
 import pandas as pd
-from bs4 import BeautifulSoup, Comment
 import cloudscraper
 
+import fbref_cache
+import fbref_html
+
 URL = "https://fbref.com/en/comps/9/schedule/Premier-League-Scores-and-Fixtures"
 
 HEADERS = {
@@ -30,7 +31,7 @@ HEADERS = {
 def fetch_html(url: str) -> str:
     scraper = cloudscraper.create_scraper()
     scraper.headers.update(HEADERS)
-    resp = scraper.get(url, timeout=30)
+    resp = fbref_cache.cached_get(scraper, url, timeout=30)
     if resp.status_code == 403:
         raise RuntimeError(
             "Še vedno 403 – tudi cloudscraper ni uspel. "
@@ -41,19 +42,10 @@ def fetch_html(url: str) -> str:
 
 
 def pick_table_from_html(html: str) -> str:
-    soup = BeautifulSoup(html, "lxml")
-
-    # 1) v živem DOM-u
-    direct = soup.find("table", id=re.compile(r"^sched_"))
-    if direct:
-        return str(direct)
-
-    # 2) v komentarjih
-    for com in soup.find_all(string=lambda s: isinstance(s, Comment)):
-        sub = BeautifulSoup(com, "lxml")
-        tab = sub.find("table", id=re.compile(r"^sched_"))
-        if tab:
-            return str(tab)
+    # v živem DOM-u ali v komentarjih
+    tab = fbref_html.table_html(html, r"sched_[^\"']*")
+    if tab:
+        return tab
 
     raise RuntimeError("Tabela ni bila najdena (niti v DOM-u niti v komentarjih).")
 
@@ -3,16 +3,21 @@
 Scrape FBref Premier-League 2024-25:
   matchweek, zaporedni match_id, datum, goli, xG, xGA
 ----------------------------------------------------------------
-Ustvari CSV: scrape_pl_24_25_02.csv
+Ustvari CSV: scrape_pl_24_25_02.csv (cel razpored – neodigrane tekme s praznimi goli,
+za predict_tot_bha --remaining in season_sim.py)
+in shrambo značilk ekip (feature_store): scrape_pl_24_25_02.features.npz
 """
 
-import re
 import sys
 from io import StringIO
 import pandas as pd
-from bs4 import BeautifulSoup, Comment
 import cloudscraper
 
+import fbref_cache
+import fbref_html
+import fbref_replay
+import feature_store
+
 URL = "https://fbref.com/en/comps/9/schedule/Premier-League-Scores-and-Fixtures"
 
 HEADERS = {
@@ -26,9 +31,11 @@ HEADERS = {
 
 
 def fetch_html(url: str) -> str:
+    if fbref_replay.REPLAY:                     # FBREF_BACKEND=replay: posneti korpus, brez omrežja
+        return fbref_replay.fetch(url)
     scraper = cloudscraper.create_scraper()
     scraper.headers.update(HEADERS)
-    resp = scraper.get(url, timeout=30)
+    resp = fbref_cache.cached_get(fbref_replay.via_origin(scraper), url, timeout=30)
     if resp.status_code == 403:
         raise RuntimeError(
             "HTTP 403 – cloudscraper ni uspel. "
@@ -38,38 +45,31 @@ def fetch_html(url: str) -> str:
     return resp.text
 
 
-def get_table_soup(html: str) -> BeautifulSoup:
-    soup = BeautifulSoup(html, "lxml")
-
-    tab = soup.find("table", id=re.compile(r"^sched_"))
+def get_table_html(html: str) -> str:
+    tab = fbref_html.table_html(html, r"sched_[^\"']*")
     if tab:
         return tab
 
-    for com in soup.find_all(string=lambda s: isinstance(s, Comment)):
-        sub = BeautifulSoup(com, "lxml")
-        tab = sub.find("table", id=re.compile(r"^sched_"))
-        if tab:
-            return tab
-
     raise RuntimeError("Tabela ni bila najdena – FBref je spremenil strukturo.")
 
 
-def build_dataframe(table_soup: BeautifulSoup) -> pd.DataFrame:
-    df = pd.read_html(StringIO(str(table_soup)))[0]
+def build_dataframe(table_html: str) -> pd.DataFrame:
+    df = pd.read_html(StringIO(table_html))[0]
     df.columns = [c[0] if isinstance(c, tuple) else c for c in df.columns]
 
-    df = df[df["Score"].notna()].copy()
+    # vse tekme razporeda; prazne vrstice in ponovljene glave tabele izpadejo
+    df["Wk"] = pd.to_numeric(df["Wk"], errors="coerce")
+    df = df[df["Wk"].notna() & df["Home"].notna()].copy()
 
     # Matchweek
     df = df.rename(columns={"Wk": "matchweek_number"})
     df["matchweek_number"] = df["matchweek_number"].astype("Int64")
 
-    # Goals
+    # Goals (neodigrana tekma → <NA>)
     df[["home_goals", "away_goals"]] = (
         df["Score"]
-        .str.replace(r"[^\d–\-]", "", regex=True)
-        .str.replace("–", "-", regex=False)
-        .str.split("-", expand=True)
+        .astype("string")
+        .str.extract(r"(\d+)\D+(\d+)")
         .astype("Int64")
     )
 
@@ -106,13 +106,17 @@ def build_dataframe(table_soup: BeautifulSoup) -> pd.DataFrame:
 
 def main() -> None:
     html = fetch_html(URL)
-    table_soup = get_table_soup(html)
-    schedule = build_dataframe(table_soup)
+    table_html = get_table_html(html)
+    schedule = build_dataframe(table_html)
 
     out_file = "scrape_pl_24_25_02.csv"     # ← nova izhodna datoteka
     schedule.to_csv(out_file, index=False)
     print(f"Končano. CSV shranjen kot '{out_file}'.")
 
+    features_file = "scrape_pl_24_25_02.features.npz"
+    feature_store.save(feature_store.build(schedule), features_file)
+    print(f"Značilke ekip shranjene v '{features_file}'.")
+
 
 if __name__ == "__main__":
     try:
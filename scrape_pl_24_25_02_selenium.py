@@ -17,13 +17,11 @@ Odvisnosti:
 pip install pandas beautifulsoup4 lxml selenium webdriver-manager
 """
 
-import re
 import sys
 import time
 import random
 from io import StringIO
 import pandas as pd
-from bs4 import BeautifulSoup, Comment
 
 # Selenium in odvisnosti za avtomatizacijo brskalnika
 from selenium import webdriver
@@ -33,6 +31,9 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
 
+import fbref_cache
+import fbref_html
+
 # ─────────────────────────────────────────────────────────────
 # 1 · Konstante in globalne nastavitve
 # ─────────────────────────────────────────────────────────────
@@ -83,6 +84,9 @@ def get_driver() -> webdriver.Chrome:
 
 def fetch_html_selenium(url: str) -> str:
     """Naloži stran z uporabo Seleniuma, vključno z logiko za ponovne poskuse."""
+    cached = fbref_cache.lookup(url)
+    if cached is not None:
+        return cached
     driver = get_driver()
     for attempt in range(MAX_RETRIES):
         try:
@@ -97,7 +101,9 @@ def fetch_html_selenium(url: str) -> str:
             if "Just a moment..." in driver.title or "Verifying you are human" in driver.page_source:
                 raise RuntimeError(f"Zaznana Cloudflare blokada.")
 
-            return driver.page_source
+            html = driver.page_source
+            fbref_cache.store(url, html)
+            return html
 
         except Exception as exc:
             wait = random.uniform(*BACKOFF_RANGE) * (2 ** attempt)
@@ -110,26 +116,18 @@ def fetch_html_selenium(url: str) -> str:
 # 3 · Obdelava podatkov (logika iz originalne skripte s popravkom)
 # ─────────────────────────────────────────────────────────────
 
-def get_table_soup(html: str) -> BeautifulSoup:
+def get_table_html(html: str) -> str:
     """Poišče glavno tabelo s podatki, tudi če je skrita v HTML komentarju."""
-    soup = BeautifulSoup(html, "lxml")
-
-    tab = soup.find("table", id=re.compile(r"^sched_"))
+    tab = fbref_html.table_html(html, r"sched_[^\"']*")
     if tab:
         return tab
 
-    for com in soup.find_all(string=lambda s: isinstance(s, Comment)):
-        sub_soup = BeautifulSoup(com, "lxml")
-        tab = sub_soup.find("table", id=re.compile(r"^sched_"))
-        if tab:
-            return tab
-
     raise RuntimeError("Tabela ni bila najdena – FBref je morda spremenil strukturo strani.")
 
 
-def build_dataframe(table_soup: BeautifulSoup) -> pd.DataFrame:
-    """Pretvori BeautifulSoup objekt tabele v urejen Pandas DataFrame."""
-    df = pd.read_html(StringIO(str(table_soup)))[0]
+def build_dataframe(table_html: str) -> pd.DataFrame:
+    """Pretvori HTML tabele v urejen Pandas DataFrame."""
+    df = pd.read_html(StringIO(table_html))[0]
     
     df.columns = [c[0] if isinstance(c, tuple) else c for c in df.columns]
 
@@ -197,8 +195,8 @@ def main() -> None:
     """Glavna funkcija, ki orkestrira celoten proces."""
     try:
         html = fetch_html_selenium(URL)
-        table_soup = get_table_soup(html)
-        schedule = build_dataframe(table_soup)
+        table_html = get_table_html(html)
+        schedule = build_dataframe(table_html)
 
         out_file = "scrape_pl_24_25_selenium.csv"
         schedule.to_csv(out_file, index=False)
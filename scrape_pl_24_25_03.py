@@ -7,22 +7,51 @@ Kaj počne:
 -----------
 1. Z uporabo Seleniuma prenese glavni razpored sezone za vse tekme.
 2. Za vsako odigrano tekmo odpre stran "Match Report".
-3. Pravilno izlušči število rumenih kartonov za domačo in gostujočo ekipo.
+3. Iz ene naložene strani izlušči vse statistike ekip (rumeni in rdeči kartoni,
+   npxG, xG iz prekinitev, streli v okvir, PSxG − goli, podaje v kazenski
+   prostor, dotiki v zadnji tretjini, field tilt) – glej fbref_report.REPORT_STATS.
+   Dnevi počitka se izračunajo iz razporeda (le ligaške tekme).
 4. Vse zbrane podatke shrani v CSV datoteko 'scrape_pl_24_25_final_with_cards.csv'.
+   Z INCREMENTAL = True prebere obstoječo datoteko in obdela le nove ali
+   spremenjene tekme (ključ match_key = FBref ID tekme iz URL-ja poročila).
+5. Vsaka obdelana tekma se takoj zapiše v dnevnik (CHECKPOINT_FILE, JSONL);
+   po prekinitvi ponovni zagon nadaljuje tam, kjer se je ustavil.
+
+Poročila tekem se nalagajo vzporedno z bazenom POOL_SIZE brskalnikov (ali
+HTTP sej, BACKEND = "http"); skupni omejevalnik hitrosti skrbi, da skupno
+število zahtev na FBref ostane pod RATE_PER_MIN. Vse zahteve gredo na en host
+(fbref.com), zato je pretok navzgor omejen z RATE_PER_MIN (~10 strani/min) ne
+glede na POOL_SIZE: bazen le prekrije latenco nalaganja s čakanjem med
+zahtevami; ko pretok doseže RATE_PER_MIN, večji bazen ne pomaga več.
+Seja (brskalnik), ki ne odgovarja več, se zavrže in nadomesti z novo.
+
+Brez omrežja: FBREF_BACKEND=replay bere strani iz posnetega korpusa, FBREF_ORIGIN
+pošlje zahteve sej na lokalni nadomestni strežnik – glej fbref_replay.py.
+
+Vsak poskus nalaganja (čakanje, latenca, bajti, izid, backoff) in razčlenjevanje
+strani se beležita v TELEMETRY_FILE (JSONL); ob koncu se zapišejo Prometheus
+metrike (METRICS_FILE) in izpiše povzetek – glej scrape_telemetry.py.
 
 Odvisnosti:
 -----------
 pip install pandas beautifulsoup4 lxml selenium webdriver-manager
 """
 
+import os
 import re
+import json
 import sys
 import time
+import queue
 import random
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from io import StringIO
 from typing import Tuple
+from urllib.parse import urlparse
+import numpy as np
 import pandas as pd
-from bs4 import BeautifulSoup, Comment
 
 # Selenium in odvisnosti
 from selenium import webdriver
@@ -30,8 +59,15 @@ from selenium.webdriver.chrome.service import Service as ChromeService
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
 from webdriver_manager.chrome import ChromeDriverManager
 
+import fbref_cache
+import fbref_html
+import fbref_replay
+import fbref_report
+import scrape_telemetry
+
 # ─────────────────────────────────────────────────────────────
 # 1 · Konstante in globalne nastavitve
 # ─────────────────────────────────────────────────────────────
@@ -41,17 +77,31 @@ SCHEDULE_URL = f"{BASE_URL}/en/comps/9/schedule/Premier-League-Scores-and-Fixtur
 # Spremenljivka za omejitev (None pomeni brez omejitve)
 LIMIT_MATCHES = None  # <-- NASTAVLJENO ZA OBDELAVO VSEH TEKEM
 
+OUT_FILE = "scrape_pl_24_25_final_with_cards.csv"
+INCREMENTAL = True  # Obdelaj le nove/spremenjene tekme, ostale prevzemi iz OUT_FILE
+CHECKPOINT_FILE = "scrape_pl_24_25_final_with_cards.journal.jsonl"  # Izbriše se po uspešnem zapisu OUT_FILE
+TELEMETRY_FILE = "scrape_pl_24_25_final_with_cards.telemetry.jsonl"
+METRICS_FILE = "scrape_pl_24_25_final_with_cards.metrics.prom"
+# Stolpci razporeda, katerih sprememba pomeni ponovno obdelavo tekme
+SCHEDULE_COLS = ["matchweek_number", "date", "home_team", "away_team", "home_goals", "away_goals", "home_xG", "away_xG"]
+FINAL_COLS = (["matchweek_number", "match_id", "match_key", "date", "home_team", "away_team", "home_goals", "away_goals", "home_xG", "away_xG", "home_xGA", "away_xGA"]
+              + fbref_report.REPORT_COLS + fbref_report.SCHEDULE_DERIVED_COLS)
+# Brez teh stolpcev tekma velja za neobdelano (npr. datoteka iz starejše verzije z le kartoni)
+REQUIRED_COLS = ["home_crdY", "away_crdY", "home_npxG", "away_npxG"]
+
 USER_AGENTS = [
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36",
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36",
 ]
 
-DELAY_RANGE = (3.0, 7.0)  # Malce večja pavza za daljši tek
+DELAY_RANGE = (3.0, 7.0)  # Razmik med zahtevami na isti host (vljudnost), naključno v intervalu
 BACKOFF_RANGE = (20.0, 40.0)
 MAX_RETRIES = 4
 TIMEOUT = 30
 
-_driver: webdriver.Chrome | None = None
+POOL_SIZE = 3             # Sočasni brskalniki / HTTP seje – le prekrijejo latenco; pretok omejuje RATE_PER_MIN
+BACKEND = os.environ.get("FBREF_BACKEND", "selenium")  # "selenium", "http" (cloudscraper, kjer deluje) ali "replay" (korpus)
+RATE_PER_MIN = 10         # Skupna omejitev zahtev (vse niti skupaj; FBref dovoli ~10/min) = zgornja meja pretoka
 
 # ─────────────────────────────────────────────────────────────
 # 2 · Pomožne funkcije (Selenium & Logging)
@@ -61,71 +111,225 @@ def eprint(*args) -> None:
     sys.stderr.write(" ".join(map(str, args)) + "\n")
     sys.stderr.flush()
 
-def get_driver() -> webdriver.Chrome:
-    global _driver
-    if _driver is None:
-        eprint("Inicializiram Selenium WebDriver (Chrome)...")
-        options = webdriver.ChromeOptions()
-        options.add_argument("--headless")
-        options.add_argument(f"user-agent={random.choice(USER_AGENTS)}")
-        options.add_argument("--window-size=1920,1080")
-        options.add_argument("--disable-blink-features=AutomationControlled")
-        options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        options.add_experimental_option('useAutomationExtension', False)
-        
-        service = ChromeService(ChromeDriverManager().install())
-        _driver = webdriver.Chrome(service=service, options=options)
-        eprint("WebDriver je pripravljen.")
-    return _driver
+class Blocked(RuntimeError):
+    """FBref je namesto strani vrnil Cloudflare izziv ("Just a moment...")."""
 
-def fetch_html_selenium(url: str) -> str:
-    driver = get_driver()
-    for attempt in range(MAX_RETRIES):
+
+class RateLimiter:
+    """Skupni omejevalnik: vsaka nit si pod ključavnico rezervira termin, spi pa izven nje.
+
+    Termin upošteva globalno hitrost (RATE_PER_MIN) in vljudnost do posameznega
+    hosta (naključni razmik iz DELAY_RANGE). backoff() zamakne host za vse niti;
+    wait() zato vrne oba dela čakanja posebej (zamik, backoff), ne glede na poskus.
+    """
+
+    def __init__(self, per_min: float = RATE_PER_MIN,
+                 host_delay: Tuple[float, float] = DELAY_RANGE) -> None:
+        self.interval = 60.0 / per_min
+        self.host_delay = host_delay
+        self._lock = threading.Lock()
+        self._next = 0.0
+        self._next_host: dict[str, float] = {}
+        self._backoff_host: dict[str, float] = {}
+
+    def wait(self, url: str) -> Tuple[float, float]:
+        """Počaka na termin; vrne (zamik zaradi hitrosti, dodatno čakanje zaradi backoffa)."""
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            paced = max(now, self._next, self._next_host.get(host, 0.0))
+            slot = max(paced, self._backoff_host.get(host, 0.0))
+            self._next = slot + self.interval
+            self._next_host[host] = slot + random.uniform(*self.host_delay)
+        time.sleep(slot - now)
+        return paced - now, slot - paced
+
+    def backoff(self, url: str, seconds: float) -> None:
+        host = urlparse(url).netloc
+        with self._lock:
+            until = time.monotonic() + seconds
+            self._backoff_host[host] = max(self._backoff_host.get(host, 0.0), until)
+
+
+def new_session():
+    if BACKEND == "http":
+        import cloudscraper
+        session = cloudscraper.create_scraper()
+        session.headers.update({"User-Agent": random.choice(USER_AGENTS),
+                                "Accept-Language": "en-US,en;q=0.9"})
+        return fbref_replay.via_origin(session)
+    eprint("Inicializiram Selenium WebDriver (Chrome)...")
+    options = webdriver.ChromeOptions()
+    options.add_argument("--headless")
+    options.add_argument(f"user-agent={random.choice(USER_AGENTS)}")
+    options.add_argument("--window-size=1920,1080")
+    options.add_argument("--disable-blink-features=AutomationControlled")
+    options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    options.add_experimental_option('useAutomationExtension', False)
+
+    service = ChromeService(ChromeDriverManager().install())
+    driver = webdriver.Chrome(service=service, options=options)
+    eprint("WebDriver je pripravljen.")
+    return fbref_replay.via_origin(driver)
+
+
+def close_session(sess) -> None:
+    try:
+        sess.quit() if hasattr(sess, "quit") else sess.close()
+    except Exception as exc:
+        eprint(f"[OPOZORILO] Zapiranje seje: {exc}")
+
+
+def session_alive(sess) -> bool:
+    """Ali seja še odgovarja (mrtev brskalnik / gonilnik vrže izjemo že ob poizvedbi)."""
+    if BACKEND == "http":
+        return True                       # HTTP seja nima stanja, ki bi lahko odmrlo
+    try:
+        sess.current_url
+        return True
+    except Exception:
+        return False
+
+
+class SessionPool:
+    """Bazen največ `size` sej; ustvarjajo se lenobno, ob prvi potrebi.
+
+    discard() zapre odmrlo sejo in sprosti njeno mesto – naslednja potreba
+    ustvari novo, namesto da bi mrtvo sejo vrnili v bazen.
+    """
+
+    def __init__(self, size: int = POOL_SIZE) -> None:
+        self.size = size
+        self._idle: queue.Queue = queue.Queue()
+        self._all: list = []
+        self._lock = threading.Lock()
+
+    def _acquire(self):
+        while True:
+            try:
+                sess = self._idle.get_nowait()
+            except queue.Empty:
+                with self._lock:
+                    if len(self._all) < self.size:
+                        t0 = time.monotonic()
+                        sess = new_session()
+                        scrape_telemetry.session(time.monotonic() - t0)
+                        self._all.append(sess)
+                        return sess
+                sess = self._idle.get()
+            if sess is not None:          # None = mesto po zavrženi seji → poskusi znova
+                return sess
+
+    @contextmanager
+    def session(self):
+        sess = self._acquire()
         try:
-            time.sleep(random.uniform(*DELAY_RANGE))
-            eprint(f"Nalagam {url} ...")
-            driver.get(url)
-            WebDriverWait(driver, TIMEOUT).until(EC.presence_of_element_located((By.CSS_SELECTOR, "table")))
-            if "Just a moment..." in driver.title: raise RuntimeError(f"Zaznana Cloudflare blokada.")
-            return driver.page_source
-        except Exception as exc:
-            wait = random.uniform(*BACKOFF_RANGE) * (2 ** attempt)
-            eprint(f"[OPOZORILO] {exc}. Čakam {wait:.0f}s pred naslednjim poskusom.")
-            time.sleep(wait)
+            yield sess
+        finally:
+            with self._lock:
+                live = any(s is sess for s in self._all)
+            if live:
+                self._idle.put(sess)
+
+    def discard(self, sess) -> None:
+        with self._lock:
+            self._all = [s for s in self._all if s is not sess]
+        close_session(sess)
+        self._idle.put(None)              # zbudi nit, ki čaka na prosto sejo
+
+    def close(self) -> None:
+        with self._lock:
+            sessions, self._all = self._all, []
+        for sess in sessions:
+            close_session(sess)
+
+
+# lokalni nadomestni strežnik (FBREF_ORIGIN) ne potrebuje vljudnostnih zamikov
+_limiter = RateLimiter(float("inf"), (0.0, 0.0)) if fbref_replay.ORIGIN else RateLimiter()
+_pool = SessionPool()
+
+def load_page(session, url: str) -> str:
+    if BACKEND == "http":
+        resp = session.get(url, timeout=TIMEOUT)
+        # Cloudflare izziv pride kot 403/503 → preveri ga pred raise_for_status, sicer šteje kot error
+        if "Just a moment..." in resp.text[:5000]: raise Blocked("Zaznana Cloudflare blokada.")
+        resp.raise_for_status()
+        return resp.text
+    session.get(url)
+    try:
+        WebDriverWait(session, TIMEOUT).until(EC.presence_of_element_located((By.CSS_SELECTOR, "table")))
+    except TimeoutException:
+        # Cloudflare izziv nima tabele → čakanje poteče; štejemo ga kot blokado, ne kot timeout
+        if is_challenge(session): raise Blocked("Zaznana Cloudflare blokada.") from None
+        raise
+    if is_challenge(session): raise Blocked("Zaznana Cloudflare blokada.")
+    return session.page_source
+
+def is_challenge(driver) -> bool:
+    """Ali brskalnik kaže Cloudflare izziv ("Just a moment...") namesto strani."""
+    return "Just a moment..." in driver.title or "Just a moment..." in driver.page_source[:5000]
+
+def fetch_html_selenium(url: str, cache_mode: str | None = None) -> str:
+    """HTML strani iz predpomnilnika ali s FBref; cache_mode="refresh" kopijo obide."""
+    if BACKEND == "replay":                     # korpus z diska: brez sej, omejevalnika in predpomnilnika
+        t0 = time.monotonic()
+        try:
+            html = fbref_replay.fetch(url)
+        except fbref_replay.Miss as exc:
+            scrape_telemetry.request(url, 0, 0.0, 0.0, time.monotonic() - t0, exc=exc)
+            raise
+        scrape_telemetry.request(url, 0, 0.0, 0.0, time.monotonic() - t0, len(html.encode("utf-8")))
+        return html
+    cached = fbref_cache.lookup(url, cache_mode)
+    if cached is not None:
+        scrape_telemetry.cache_hit(url, len(cached.encode("utf-8")))
+        return cached
+    for attempt in range(MAX_RETRIES):
+        with _pool.session() as session:
+            (delay, held), t0 = (0.0, 0.0), time.monotonic()
+            try:
+                delay, held = _limiter.wait(url)
+                eprint(f"Nalagam {url} ...")
+                t0 = time.monotonic()
+                html = load_page(session, url)
+                latency = time.monotonic() - t0
+                fbref_cache.store(url, html)
+                scrape_telemetry.request(url, attempt, delay, held, latency, len(html.encode("utf-8")))
+                return html
+            except Exception as exc:
+                wait = random.uniform(*BACKOFF_RANGE) * (2 ** attempt)
+                scrape_telemetry.request(url, attempt, delay, held, time.monotonic() - t0,
+                                         exc=exc, backoff_s=wait)
+                eprint(f"[OPOZORILO] {exc}. Čakam {wait:.0f}s pred naslednjim poskusom.")
+                _limiter.backoff(url, wait)
+                if not session_alive(session):
+                    eprint("[OPOZORILO] Seja ne odgovarja – zavržem jo, naslednji poskus dobi novo.")
+                    _pool.discard(session)
     raise RuntimeError(f"Stran se ni uspela naložiti po {MAX_RETRIES} poskusih: {url}")
 
 # ─────────────────────────────────────────────────────────────
 # 3 · Obdelava podatkov
 # ─────────────────────────────────────────────────────────────
 
-def get_table_soup(html: str) -> BeautifulSoup:
-    soup = BeautifulSoup(html, "lxml")
-    tab = soup.find("table", id=re.compile(r"^sched_"))
+def get_table_html(html: str) -> str:
+    tab = fbref_html.table_html(html, r"sched_[^\"']*")
     if tab: return tab
-    for com in soup.find_all(string=lambda s: isinstance(s, Comment)):
-        sub_soup = BeautifulSoup(com, "lxml")
-        tab = sub_soup.find("table", id=re.compile(r"^sched_"))
-        if tab: return tab
     raise RuntimeError("Glavna tabela ni bila najdena.")
 
-def build_dataframe(table_soup: BeautifulSoup) -> pd.DataFrame:
-    df = pd.read_html(StringIO(str(table_soup)))[0]
+def build_dataframe(table_html: str) -> pd.DataFrame:
+    df = pd.read_html(StringIO(table_html))[0]
     df.columns = [c[0] if isinstance(c, tuple) else c for c in df.columns]
     df['Wk'] = pd.to_numeric(df['Wk'], errors='coerce')
     df.dropna(subset=['Wk'], inplace=True)
     df = df.reset_index(drop=True)
     
     urls = []
-    all_rows = table_soup.find_all('tr')
-    for row in all_rows:
-        home_team_cell = row.find("td", {"data-stat": "home_team"})
-        if not home_team_cell or not home_team_cell.get_text(strip=True):
+    for row in fbref_html.parse_table(table_html).iter('tr'):
+        home_team_cell = row.find("td[@data-stat='home_team']")
+        if home_team_cell is None or not home_team_cell.text_content().strip():
             continue
-        report_cell = row.find("td", {"data-stat": "match_report"})
-        if report_cell and report_cell.find("a"):
-            urls.append(BASE_URL + report_cell.find("a")["href"])
-        else:
-            urls.append(None)
+        link = row.find("td[@data-stat='match_report']/a")
+        urls.append(BASE_URL + link.get("href") if link is not None else None)
     
     if len(urls) != len(df):
          raise RuntimeError(f"Neskladje pri zbiranju URL-jev: {len(urls)} vs {len(df)}.")
@@ -140,74 +344,184 @@ def build_dataframe(table_soup: BeautifulSoup) -> pd.DataFrame:
     df["away_xGA"] = df["home_xG"]
     df["date"] = pd.to_datetime(df["date"]).dt.strftime("%Y-%m-%d")
     df.insert(1, "match_id", range(1, len(df) + 1))
+    df.insert(2, "match_key", [match_key(u, d, h, a) for u, d, h, a in
+                               zip(df["match_report_url"], df["date"], df["home_team"], df["away_team"])])
     return df
 
-def fetch_match_cards(url: str) -> Tuple[int | None, int | None]:
-    if not url: return None, None
-    try:
-        html = fetch_html_selenium(url)
-        soup = BeautifulSoup(html, 'lxml')
-        
-        player_stats_tables = soup.find_all("table", id=lambda x: x and x.startswith("stats_") and x.endswith("_summary"))
-        
-        if len(player_stats_tables) < 2:
-            eprint(f"[OPOZORILO] Na strani {url} nista bili najdeni obe tabeli s statistikami igralcev.")
-            return None, None
-        
-        home_table, away_table = player_stats_tables[0], player_stats_tables[1]
+def match_key(url: str | None, date: str, home: str, away: str) -> str:
+    """Stabilen ključ tekme: FBref ID iz URL-ja poročila, sicer datum + ekipi."""
+    m = re.search(r"/matches/([0-9a-f]{8})/", url or "")
+    return m.group(1) if m else f"{date}_{home}_{away}"
 
-        home_cards_td = home_table.select_one("tfoot td[data-stat='cards_yellow']")
-        away_cards_td = away_table.select_one("tfoot td[data-stat='cards_yellow']")
+def load_existing(path: str) -> pd.DataFrame | None:
+    if not INCREMENTAL or not os.path.exists(path):
+        return None
+    existing = pd.read_csv(path, dtype={"match_key": str})
+    if "match_key" not in existing.columns:
+        eprint(f"[OPOZORILO] '{path}' nima stolpca match_key – obdelujem vse tekme.")
+        return None
+    return existing
 
-        home_crdY = int(home_cards_td.text) if home_cards_td and home_cards_td.text.strip() else 0
-        away_crdY = int(away_cards_td.text) if away_cards_td and away_cards_td.text.strip() else 0
-        
-        return home_crdY, away_crdY
+def pending_mask(schedule: pd.DataFrame, existing: pd.DataFrame | None) -> pd.Series:
+    """True za tekme, ki so nove, spremenjene v razporedu ali brez statistik (prejšnja napaka)."""
+    if existing is None:
+        return pd.Series(True, index=schedule.index)
+    old = existing.drop_duplicates("match_key", keep="last").set_index("match_key")
+    joined = schedule[["match_key"] + SCHEDULE_COLS].join(
+        old.reindex(columns=SCHEDULE_COLS + REQUIRED_COLS), on="match_key", rsuffix="_old")
+    mask = joined[REQUIRED_COLS].isna().any(axis=1)
+    for col in SCHEDULE_COLS:
+        new, prev = joined[col], joined[f"{col}_old"]
+        if new.dtype.kind in "iuf" or str(new.dtype) == "Int64":
+            differs = ~pd.Series(np.isclose(pd.to_numeric(new, errors="coerce").astype(float),
+                                            pd.to_numeric(prev, errors="coerce").astype(float),
+                                            equal_nan=True), index=joined.index)
+        else:
+            differs = new.astype(str) != prev.astype(str)
+        mask |= differs
+    return mask
+
+def upsert(existing: pd.DataFrame | None, fresh: pd.DataFrame) -> pd.DataFrame:
+    """Nove vrstice zamenjajo stare z enakim match_key; match_id se oštevilči po datumu."""
+    if existing is None:
+        return fresh.reset_index(drop=True)
+    keep = existing[~existing["match_key"].isin(fresh["match_key"])]
+    out = pd.concat([keep, fresh], ignore_index=True)
+    out = out.sort_values(["date", "match_id"], kind="stable").reset_index(drop=True)
+    out["match_id"] = range(1, len(out) + 1)
+    return out
+
+class Checkpoint:
+    """Append-only JSONL dnevnik zaključenih tekem (ena vrstica = ena tekma).
+
+    Vsak zapis se takoj izplakne in fsync-a, zato sesutje ali blokada izgubi
+    največ tekmo, ki je bila v teku. Nepopolna zadnja vrstica se ob branju preskoči.
+    """
 
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.done: dict[str, dict] = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as fh:
+                for line in fh:
+                    try:
+                        rec = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    self.done[rec["match_key"]] = rec
+        self._fh = open(path, "a", encoding="utf-8")
+
+    def append(self, rec: dict) -> None:
+        self._fh.write(json.dumps(rec, ensure_ascii=False) + "\n")
+        self._fh.flush()
+        os.fsync(self._fh.fileno())
+        self.done[rec["match_key"]] = rec
+
+    def close(self, remove: bool = False) -> None:
+        if not self._fh.closed:
+            self._fh.close()
+        if remove and os.path.exists(self.path):
+            os.remove(self.path)
+
+def fetch_match_stats(url: str, refresh: bool = False) -> dict | None:
+    """Vse stolpce fbref_report.REPORT_COLS z ene strani poročila; None ob napaki.
+
+    refresh=True prenese poročilo znova mimo predpomnilnika (tekma se je v razporedu
+    spremenila – kopija poročila je zastarela, TTL["match"] pa je neomejen)."""
+    if not url: return None
+    t0 = None
+    try:
+        html = fetch_html_selenium(url, "refresh" if refresh else None)
+        t0 = time.perf_counter()
+        stats = fbref_report.extract(html)
+        scrape_telemetry.parse(url, time.perf_counter() - t0)
+        return stats
     except Exception as e:
+        if t0 is not None:
+            scrape_telemetry.parse(url, time.perf_counter() - t0, ok=False)
         eprint(f"[NAPAKA] pri obdelavi {url}: {e}")
-        return None, None
+        return None
 
 # ─────────────────────────────────────────────────────────────
 # 4 · Glavni program
 # ─────────────────────────────────────────────────────────────
 
-def main() -> None:
+def scrape_schedule(schedule_url: str = SCHEDULE_URL, out_file: str = OUT_FILE,
+                    checkpoint_file: str = CHECKPOINT_FILE, limit: int | None = LIMIT_MATCHES) -> pd.DataFrame:
+    """Razpored + statistike vseh (novih) tekem ene sezone → out_file; vrne končno tabelo.
+
+    Vse zahteve gredo prek skupnega bazena sej, omejevalnika in predpomnilnika,
+    zato lahko kličoči (npr. scrape_fbref_catalog) zaporedoma obdela več sezon.
+    """
+    journal = None
     try:
-        html = fetch_html_selenium(SCHEDULE_URL)
-        table_soup = get_table_soup(html)
-        schedule = build_dataframe(table_soup)
-        
-        if LIMIT_MATCHES and LIMIT_MATCHES > 0:
-            eprint(f"\nNajdenih {len(schedule)} odigranih tekem. OMEJUJEM na prvih {LIMIT_MATCHES} za testiranje...")
-            schedule_to_process = schedule.head(LIMIT_MATCHES).copy()
+        html = fetch_html_selenium(schedule_url)
+        t0 = time.perf_counter()
+        table_html = get_table_html(html)
+        schedule = build_dataframe(table_html)
+        scrape_telemetry.parse(schedule_url, time.perf_counter() - t0)
+        existing = load_existing(out_file)
+        pending = schedule[pending_mask(schedule, existing)]
+        if existing is not None:
+            eprint(f"\nInkrementalno: {len(schedule) - len(pending)} tekem že obdelanih, {len(pending)} novih ali spremenjenih.")
+
+        if limit and limit > 0:
+            eprint(f"\nNajdenih {len(pending)} tekem za obdelavo. OMEJUJEM na prvih {limit} za testiranje...")
+            schedule_to_process = pending.head(limit).copy()
         else:
-            eprint(f"\nNajdenih {len(schedule)} odigranih tekem. Začenjam z zbiranjem podatkov o kartonih...")
-            schedule_to_process = schedule.copy()
+            eprint(f"\nNajdenih {len(pending)} tekem za obdelavo. Začenjam z zbiranjem statistik tekem...")
+            schedule_to_process = pending.copy()
 
-        all_home_cards, all_away_cards = [], []
+        journal = Checkpoint(checkpoint_file)
+        todo = schedule_to_process[~schedule_to_process['match_key'].isin(journal.done)]
+        n = len(schedule_to_process)
+        if len(todo) < n:
+            eprint(f"Nadaljujem iz dnevnika '{checkpoint_file}': {n - len(todo)} tekem že obdelanih.")
 
-        for index, row in schedule_to_process.iterrows():
-            eprint(f"Obdelujem tekmo {row['match_id']}/{len(schedule_to_process)}: {row['home_team']} vs {row['away_team']}")
-            home_crdY, away_crdY = fetch_match_cards(row['match_report_url'])
-            all_home_cards.append(home_crdY)
-            all_away_cards.append(away_crdY)
+        # tekme, ki so že v out_file, so spremenjene (ali brez statistik) → mimo predpomnilnika
+        known = set(existing["match_key"]) if existing is not None else set()
+        with ThreadPoolExecutor(max_workers=POOL_SIZE) as ex:
+            futures = {ex.submit(fetch_match_stats, row['match_report_url'],
+                                 row['match_key'] in known): row
+                       for _, row in todo.iterrows()}
+            for done, fut in enumerate(as_completed(futures), 1):
+                row = futures[fut]
+                stats = fut.result()
+                ok = stats is not None
+                if ok:
+                    journal.append({"match_key": row['match_key'], **stats})
+                eprint(f"[{done}/{len(todo)}] {'OK' if ok else 'NAPAKA'} tekma {row['match_id']}: {row['home_team']} vs {row['away_team']}")
 
-        schedule_to_process['home_crdY'] = all_home_cards
-        schedule_to_process['away_crdY'] = all_away_cards
+        recs = pd.DataFrame([journal.done.get(k, {}) for k in schedule_to_process['match_key']],
+                            index=schedule_to_process.index)
+        recs = recs.reindex(columns=fbref_report.REPORT_COLS).astype({c: "Int64" for c in fbref_report.INT_COLS})
+        failed = int(recs[REQUIRED_COLS].isna().any(axis=1).sum())
+        if failed:
+            eprint(f"[OPOZORILO] Podatki manjkajo za {failed}/{n} tekem.")
+
+        schedule_to_process[fbref_report.REPORT_COLS] = recs
+        fresh = schedule_to_process.drop(columns=['match_report_url'], errors='ignore')
+        fresh = fresh.reindex(columns=FINAL_COLS)
+        # dnevi počitka so odvisni od sosednjih tekem, zato se izračunajo na celotni datoteki
+        final_schedule = fbref_report.rest_days(upsert(existing, fresh))[FINAL_COLS]
 
-        final_cols = ["matchweek_number", "match_id", "date", "home_team", "away_team", "home_goals", "away_goals", "home_xG", "away_xG", "home_xGA", "away_xGA", "home_crdY", "away_crdY"]
-        final_schedule = schedule_to_process.drop(columns=['match_report_url'], errors='ignore')[final_cols]
-        
-        out_file = "scrape_pl_24_25_final_with_cards.csv"
         final_schedule.to_csv(out_file, index=False)
-        eprint(f"\n[KONČANO] Podatki za {len(final_schedule)} tekem so shranjeni v datoteko '{out_file}'.")
+        journal.close(remove=True)
+        eprint(f"\n[KONČANO] {len(fresh)} tekem obdelanih, skupaj {len(final_schedule)} tekem v datoteki '{out_file}'.")
+        return final_schedule
 
     finally:
-        global _driver
-        if _driver:
-            eprint("Zapiram brskalnik...")
-            _driver.quit()
+        if journal:
+            journal.close()
+
+def main() -> None:
+    scrape_telemetry.start(TELEMETRY_FILE)
+    try:
+        scrape_schedule()
+    finally:
+        eprint("Zapiram brskalnike...")
+        _pool.close()
+        eprint("\n" + scrape_telemetry.finish(METRICS_FILE))
 
 if __name__ == "__main__":
     try:
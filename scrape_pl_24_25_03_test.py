@@ -15,14 +15,12 @@ Odvisnosti:
 pip install pandas beautifulsoup4 lxml selenium webdriver-manager
 """
 
-import re
 import sys
 import time
 import random
 from io import StringIO
 from typing import Tuple
 import pandas as pd
-from bs4 import BeautifulSoup, Comment
 
 # Selenium in odvisnosti
 from selenium import webdriver
@@ -32,6 +30,10 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
 
+import fbref_cache
+import fbref_html
+import fbref_replay
+
 # ─────────────────────────────────────────────────────────────
 # 1 · Konstante in globalne nastavitve
 # ─────────────────────────────────────────────────────────────
@@ -73,11 +75,14 @@ def get_driver() -> webdriver.Chrome:
         options.add_experimental_option('useAutomationExtension', False)
         
         service = ChromeService(ChromeDriverManager().install())
-        _driver = webdriver.Chrome(service=service, options=options)
+        _driver = fbref_replay.via_origin(webdriver.Chrome(service=service, options=options))
         eprint("WebDriver je pripravljen.")
     return _driver
 
 def fetch_html_selenium(url: str) -> str:
+    if fbref_replay.REPLAY: return fbref_replay.fetch(url)
+    cached = fbref_cache.lookup(url)
+    if cached is not None: return cached
     driver = get_driver()
     for attempt in range(MAX_RETRIES):
         try:
@@ -86,7 +91,9 @@ def fetch_html_selenium(url: str) -> str:
             driver.get(url)
             WebDriverWait(driver, TIMEOUT).until(EC.presence_of_element_located((By.CSS_SELECTOR, "table")))
             if "Just a moment..." in driver.title: raise RuntimeError(f"Zaznana Cloudflare blokada.")
-            return driver.page_source
+            html = driver.page_source
+            fbref_cache.store(url, html)
+            return html
         except Exception as exc:
             wait = random.uniform(*BACKOFF_RANGE) * (2 ** attempt)
             eprint(f"[OPOZORILO] {exc}. Čakam {wait:.0f}s pred naslednjim poskusom.")
@@ -97,34 +104,25 @@ def fetch_html_selenium(url: str) -> str:
 # 3 · Obdelava podatkov
 # ─────────────────────────────────────────────────────────────
 
-def get_table_soup(html: str) -> BeautifulSoup:
-    soup = BeautifulSoup(html, "lxml")
-    tab = soup.find("table", id=re.compile(r"^sched_"))
+def get_table_html(html: str) -> str:
+    tab = fbref_html.table_html(html, r"sched_[^\"']*")
     if tab: return tab
-    for com in soup.find_all(string=lambda s: isinstance(s, Comment)):
-        sub_soup = BeautifulSoup(com, "lxml")
-        tab = sub_soup.find("table", id=re.compile(r"^sched_"))
-        if tab: return tab
     raise RuntimeError("Glavna tabela ni bila najdena.")
 
-def build_dataframe(table_soup: BeautifulSoup) -> pd.DataFrame:
-    df = pd.read_html(StringIO(str(table_soup)))[0]
+def build_dataframe(table_html: str) -> pd.DataFrame:
+    df = pd.read_html(StringIO(table_html))[0]
     df.columns = [c[0] if isinstance(c, tuple) else c for c in df.columns]
     df['Wk'] = pd.to_numeric(df['Wk'], errors='coerce')
     df.dropna(subset=['Wk'], inplace=True)
     df = df.reset_index(drop=True)
     
     urls = []
-    all_rows = table_soup.find_all('tr')
-    for row in all_rows:
-        home_team_cell = row.find("td", {"data-stat": "home_team"})
-        if not home_team_cell or not home_team_cell.get_text(strip=True):
+    for row in fbref_html.parse_table(table_html).iter('tr'):
+        home_team_cell = row.find("td[@data-stat='home_team']")
+        if home_team_cell is None or not home_team_cell.text_content().strip():
             continue
-        report_cell = row.find("td", {"data-stat": "match_report"})
-        if report_cell and report_cell.find("a"):
-            urls.append(BASE_URL + report_cell.find("a")["href"])
-        else:
-            urls.append(None)
+        link = row.find("td[@data-stat='match_report']/a")
+        urls.append(BASE_URL + link.get("href") if link is not None else None)
     
     if len(urls) != len(df):
          raise RuntimeError(f"Neskladje pri zbiranju URL-jev: {len(urls)} vs {len(df)}.")
@@ -145,22 +143,20 @@ def fetch_match_cards(url: str) -> Tuple[int | None, int | None]:
     if not url: return None, None
     try:
         html = fetch_html_selenium(url)
-        soup = BeautifulSoup(html, 'lxml')
-        
-        player_stats_tables = soup.find_all("table", id=lambda x: x and x.startswith("stats_") and x.endswith("_summary"))
+        player_stats_tables = fbref_html.tables_html(html, r"stats_[^\"']+_summary")
         
         if len(player_stats_tables) < 2:
             eprint(f"[OPOZORILO] Na strani {url} nista bili najdeni obe tabeli s statistikami igralcev.")
             return None, None
         
-        home_table, away_table = player_stats_tables[0], player_stats_tables[1]
+        home_table, away_table = (fbref_html.parse_table(t) for t in player_stats_tables[:2])
 
         # POTRJEN IN PRAVILEN SELEKTOR: Išče v nogi tabele (tfoot)
-        home_cards_td = home_table.select_one("tfoot td[data-stat='cards_yellow']")
-        away_cards_td = away_table.select_one("tfoot td[data-stat='cards_yellow']")
+        home_cards = fbref_html.tfoot_stat(home_table, "cards_yellow")
+        away_cards = fbref_html.tfoot_stat(away_table, "cards_yellow")
 
-        home_crdY = int(home_cards_td.text) if home_cards_td and home_cards_td.text.strip() else 0
-        away_crdY = int(away_cards_td.text) if away_cards_td and away_cards_td.text.strip() else 0
+        home_crdY = int(home_cards) if home_cards else 0
+        away_crdY = int(away_cards) if away_cards else 0
         
         return home_crdY, away_crdY
 
@@ -175,8 +171,8 @@ def fetch_match_cards(url: str) -> Tuple[int | None, int | None]:
 def main() -> None:
     try:
         html = fetch_html_selenium(SCHEDULE_URL)
-        table_soup = get_table_soup(html)
-        schedule = build_dataframe(table_soup)
+        table_html = get_table_html(html)
+        schedule = build_dataframe(table_html)
         
         if LIMIT_MATCHES and LIMIT_MATCHES > 0:
             eprint(f"\nNajdenih {len(schedule)} odigranih tekem. OMEJUJEM na prvih {LIMIT_MATCHES} za testiranje...")
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Telemetrija scraperjev FBref (skupna vsem nitim)
+-------------------------------------------------
+• en zapis na poskus nalaganja: razred URL-ja (fbref_cache.page_kind), poskus,
+  čakanje v omejevalniku (zamik in backoff posebej), latenca, bajti, izid (ok / cache / blocked / timeout / error)
+  in zamik pred naslednjim poskusom (BACKOFF_RANGE · 2**poskus)
+• ločeni zapisi za razčlenjevanje strani (parse) in zagon brskalnika (session)
+• izvoz: JSONL dnevnik (sproti, ena vrstica na dogodek), Prometheus tekstovna
+  datoteka (števci, histogrami, delež blokad) in povzetek ob koncu zagona
+
+Uporaba:
+    scrape_telemetry.start("scrape_telemetry.jsonl")
+    ... scrape ...
+    scrape_telemetry.finish("scrape_metrics.prom")   # zapiše metrike, vrne povzetek
+"""
+
+import json
+import time
+import threading
+from pathlib import Path
+
+import numpy as np
+
+import fbref_cache
+
+TELEMETRY_FILE = "scrape_telemetry.jsonl"
+METRICS_FILE = "scrape_metrics.prom"
+LATENCY_BUCKETS = (0.5, 1, 2, 5, 10, 20, 30, 60)
+PARSE_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+PREFIX = "fbref"
+
+_lock = threading.Lock()
+_events: list[dict] = []
+_fh = None
+_t0 = time.time()
+
+
+# ─────────────────────────────────────────────────────────────
+def start(path: str | None = TELEMETRY_FILE) -> None:
+    """Začne nov zagon: počisti dogodke in odpre JSONL dnevnik (None = le v pomnilniku)."""
+    global _fh, _t0
+    with _lock:
+        _events.clear()
+        _t0 = time.time()
+        if _fh:
+            _fh.close()
+        _fh = open(path, "a", encoding="utf-8") if path else None
+
+
+def _emit(event: str, **fields) -> None:
+    rec = {"ts": round(time.time(), 3), "event": event,
+           "thread": threading.current_thread().name, **fields}
+    with _lock:
+        _events.append(rec)
+        if _fh:
+            _fh.write(json.dumps(rec, ensure_ascii=False) + "\n")
+            _fh.flush()
+
+
+def outcome(exc: BaseException | None) -> str:
+    """Izid poskusa iz izjeme: blocked (Cloudflare), timeout ali error."""
+    if exc is None:
+        return "ok"
+    if "Cloudflare" in str(exc) or type(exc).__name__ == "Blocked":
+        return "blocked"
+    if "Timeout" in type(exc).__name__:
+        return "timeout"
+    return "error"
+
+
+def request(url: str, attempt: int, delay_s: float, backoff_wait_s: float, latency_s: float,
+            nbytes: int = 0, exc: BaseException | None = None, backoff_s: float = 0.0) -> None:
+    """delay_s / backoff_wait_s: dela čakanja iz RateLimiter.wait (hitrost / backoff hosta)."""
+    _emit("request", url=url, url_class=fbref_cache.page_kind(url), attempt=attempt,
+          outcome=outcome(exc), delay_s=round(delay_s, 4), backoff_wait_s=round(backoff_wait_s, 4),
+          latency_s=round(latency_s, 4), bytes=nbytes, backoff_s=round(backoff_s, 3), error=str(exc) if exc else None)
+
+
+def cache_hit(url: str, nbytes: int = 0) -> None:
+    _emit("request", url=url, url_class=fbref_cache.page_kind(url), attempt=0,
+          outcome="cache", delay_s=0.0, backoff_wait_s=0.0, latency_s=0.0, bytes=nbytes,
+          backoff_s=0.0, error=None)
+
+
+def parse(url: str, parse_s: float, ok: bool = True) -> None:
+    _emit("parse", url=url, url_class=fbref_cache.page_kind(url),
+          parse_s=round(parse_s, 4), outcome="ok" if ok else "error")
+
+
+def session(latency_s: float) -> None:
+    _emit("session", latency_s=round(latency_s, 3))
+
+
+# ─────────────────────────────────────────────────────────────
+def _events_of(kind: str) -> list[dict]:
+    with _lock:
+        return [e for e in _events if e["event"] == kind]
+
+
+def _labels(**kw) -> str:
+    return "{" + ",".join(f'{k}="{v}"' for k, v in kw.items()) + "}" if kw else ""
+
+
+def _histogram(lines: list[str], name: str, help_: str, groups: dict, buckets) -> None:
+    lines += [f"# HELP {name} {help_}", f"# TYPE {name} histogram"]
+    for cls, vals in sorted(groups.items()):
+        vals = np.asarray(vals, dtype=float)
+        for le in buckets:
+            lines.append(f"{name}_bucket{_labels(url_class=cls, le=le)} {int((vals <= le).sum())}")
+        lines.append(f"{name}_bucket{_labels(url_class=cls, le='+Inf')} {len(vals)}")
+        lines.append(f"{name}_sum{_labels(url_class=cls)} {vals.sum():.4f}")
+        lines.append(f"{name}_count{_labels(url_class=cls)} {len(vals)}")
+
+
+def _count(rows: list[dict], keys: tuple, val=None) -> dict:
+    """Vsota (ali število) zapisov po oznakah keys → {((ključ, vrednost), ...): vsota}."""
+    out: dict = {}
+    for r in rows:
+        k = tuple((key, r[key]) for key in keys)
+        out[k] = out.get(k, 0) + (val(r) if val else 1)
+    return out
+
+
+def _by_class(rows: list[dict], field: str) -> dict:
+    out: dict = {}
+    for r in rows:
+        out.setdefault(r["url_class"], []).append(r[field])
+    return out
+
+
+def _counter(lines: list[str], name: str, help_: str, values: dict, kind: str = "counter") -> None:
+    lines += [f"# HELP {name} {help_}", f"# TYPE {name} {kind}"]
+    for labels, v in sorted(values.items()):
+        lines.append(f"{name}{_labels(**dict(labels))} {v:g}")
+
+
+def prometheus() -> str:
+    """Metrike v Prometheus tekstovni obliki (izračunane iz zbranih dogodkov)."""
+    reqs, parses, sessions = _events_of("request"), _events_of("parse"), _events_of("session")
+    net = [r for r in reqs if r["outcome"] != "cache"]
+
+    lines: list[str] = []
+    _counter(lines, f"{PREFIX}_requests_total", "Poskusi nalaganja po razredu URL-ja in izidu.",
+             _count(reqs, ("url_class", "outcome")))
+    _histogram(lines, f"{PREFIX}_request_latency_seconds", "Latenca nalaganja strani (brez čakanja).",
+               _by_class(net, "latency_s"), LATENCY_BUCKETS)
+    _counter(lines, f"{PREFIX}_response_bytes_total", "Preneseni bajti po razredu URL-ja.",
+             _count(net, ("url_class",), lambda r: r["bytes"]))
+    sleep = {(("reason", "delay"),): sum(r["delay_s"] for r in net),
+             (("reason", "backoff"),): sum(r["backoff_wait_s"] for r in net)}
+    _counter(lines, f"{PREFIX}_sleep_seconds_total",
+             "Čas v omejevalniku: delay = DELAY_RANGE/RATE_PER_MIN, "
+             "backoff = zamik hosta po napaki (velja za vse niti).", sleep)
+    _counter(lines, f"{PREFIX}_backoff_scheduled_seconds_total",
+             "Naloženi zamiki BACKOFF_RANGE · 2**poskus po neuspelih poskusih.",
+             {(): sum(r["backoff_s"] for r in net)})
+    blocked = sum(r["outcome"] == "blocked" for r in net)
+    _counter(lines, f"{PREFIX}_block_rate", "Delež poskusov z zaznano Cloudflare blokado.",
+             {(): blocked / len(net) if net else 0.0}, kind="gauge")
+    _histogram(lines, f"{PREFIX}_parse_seconds", "Čas razčlenjevanja strani.",
+               _by_class(parses, "parse_s"), PARSE_BUCKETS)
+    _counter(lines, f"{PREFIX}_session_start_seconds_total", "Čas zagona brskalnikov / sej.",
+             {(): sum(s["latency_s"] for s in sessions)})
+    _counter(lines, f"{PREFIX}_run_seconds", "Trajanje zagona.", {(): time.time() - _t0},
+             kind="gauge")
+    return "\n".join(lines) + "\n"
+
+
+def summary() -> str:
+    """Povzetek: kam gre čas zagona in kako pogosto nas FBref blokira."""
+    reqs, parses, sessions = _events_of("request"), _events_of("parse"), _events_of("session")
+    net = [r for r in reqs if r["outcome"] != "cache"]
+    wall = time.time() - _t0
+    out = [f"=== Telemetrija scrapa ({wall / 60:.1f} min) ==="]
+    for cls in sorted({r["url_class"] for r in reqs}):
+        rows = [r for r in reqs if r["url_class"] == cls]
+        counts = {o: sum(r["outcome"] == o for r in rows) for o in
+                  ("ok", "cache", "blocked", "timeout", "error")}
+        out.append(f"{cls:<9} " + "  ".join(f"{o}={n}" for o, n in counts.items() if n))
+        lat = np.array([r["latency_s"] for r in rows if r["outcome"] != "cache"])
+        if len(lat):
+            p50, p90, p99 = np.percentile(lat, [50, 90, 99])
+            out.append(f"{'':<9} latenca p50={p50:.1f}s p90={p90:.1f}s p99={p99:.1f}s "
+                       f"max={lat.max():.1f}s")
+    load = sum(r["latency_s"] for r in net)
+    delay = sum(r["delay_s"] for r in net)
+    backoff = sum(r["backoff_wait_s"] for r in net)
+    parse_s = sum(p["parse_s"] for p in parses)
+    sess = sum(s["latency_s"] for s in sessions)
+    out.append(f"čas (seštevek čez niti): nalaganje {load:.0f}s, čakanje (zamik) {delay:.0f}s, "
+               f"čakanje (backoff) {backoff:.0f}s, razčlenjevanje {parse_s:.1f}s, "
+               f"zagon sej {sess:.0f}s")
+    blocked = sum(r["outcome"] == "blocked" for r in net)
+    if net:
+        out.append(f"blokade: {blocked}/{len(net)} poskusov ({blocked / len(net):.1%}), "
+                   f"preneseno {sum(r['bytes'] for r in net) / 2**20:.1f} MB")
+    return "\n".join(out)
+
+
+def finish(metrics_path: str | None = METRICS_FILE) -> str:
+    """Zapiše Prometheus metrike, zapre dnevnik in vrne povzetek."""
+    global _fh
+    if metrics_path:
+        Path(metrics_path).write_text(prometheus(), encoding="utf-8")
+    with _lock:
+        if _fh:
+            _fh.close()
+            _fh = None
+    return summary()
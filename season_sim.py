@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Monte Carlo preostanka sezone → končna lestvica
+• trenutna lestvica iz odigranih tekem, model (predict_tot_bha.fit_model) iz istih tekem
+• vse preostale tekme × vse simulirane sezone naenkrat: polje (tekme, sezone)
+• točke / goli ekip z matričnim množenjem (ekipe × tekme) @ (tekme × sezone)
+• vrstni red: točke, gol razlika, dani goli, nato žreb – en sestavljen int64 ključ
+• v kosih po CHUNK sezon, da poraba pomnilnika ostane omejena
+
+Primeri:
+    python season_sim.py                          # neodigrane tekme iz razporeda
+    python season_sim.py scrape_pl_24_25_03.csv --fixtures scrape_pl_24_25_02.csv
+    python season_sim.py --matchweek 30           # kot da so odigrani le krogi < 30
+    python season_sim.py --asof 2025-03-01 --sims 200000
+"""
+
+import sys, argparse, pathlib, time, numpy as np, pandas as pd
+
+import predict_tot_bha as ptb
+
+SIMS        = 100_000
+CHUNK       = 20_000       # sezon na kos (tekme × CHUNK × int64 ≈ 30 MB pri 190 tekmah)
+TOP_N       = 4            # Liga prvakov
+RELEGATED   = 3            # izpadejo zadnji trije
+OUT_DEFAULT = "season_sim.csv"
+
+# ──────────────────────────────────────────────────────────────
+def split_season(df, asof=None, matchweek=None):
+    """(odigrane, preostale): rez po datumu ali krogu, sicer po manjkajočem rezultatu."""
+    if asof is not None:
+        done = df["date"] < pd.Timestamp(asof)
+    elif matchweek is not None:
+        done = df["matchweek_number"] < matchweek
+    else:
+        done = df["home_goals"].notna()
+    done &= df["home_goals"].notna()
+    return df[done].reset_index(drop=True), df[~done].reset_index(drop=True)
+
+def with_schedule(df, schedule):
+    """Doda tekme razporeda, ki jih v df ni (par doma–gost), kot neodigrane –
+    za CSV, ki vsebuje le odigrane tekme (npr. scrape_pl_24_25_03.csv)."""
+    pairs = pd.MultiIndex.from_frame(df[["home_team", "away_team"]].astype(str))
+    new = schedule[~pd.MultiIndex.from_frame(schedule[["home_team", "away_team"]].astype(str))
+                   .isin(pairs)]
+    new = new[[c for c in ("matchweek_number", "date", "home_team", "away_team") if c in new]]
+    return pd.concat([df, new.assign(home_goals=np.nan, away_goals=np.nan)], ignore_index=True)
+
+def incidence(teams, df):
+    """Matriki (ekipe × tekme): 1, kjer je ekipa domača / gostujoča."""
+    T, F = len(teams), len(df)
+    Mh, Ma = np.zeros((T, F)), np.zeros((T, F))
+    Mh[teams.get_indexer(df["home_team"]), np.arange(F)] = 1
+    Ma[teams.get_indexer(df["away_team"]), np.arange(F)] = 1
+    return Mh, Ma
+
+def table(teams, played):
+    """Trenutna lestvica: točke, dani in prejeti goli po ekipah (poravnano s teams)."""
+    Mh, Ma = incidence(teams, played)
+    hg = played["home_goals"].to_numpy(float)
+    ag = played["away_goals"].to_numpy(float)
+    pts_h = 3 * (hg > ag) + (hg == ag)
+    pts_a = 3 * (ag > hg) + (hg == ag)
+    return Mh @ pts_h + Ma @ pts_a, Mh @ hg + Ma @ ag, Mh @ ag + Ma @ hg
+
+def rank(pts, gf, ga, rng):
+    """Mesto (0 = prvi) vsake ekipe v vsaki sezoni; pts/gf/ga so (ekipe, sezone)."""
+    T, S = pts.shape
+    gd = (gf - ga).astype(np.int64) + 512          # gol razlika > −512 v vseh ligah
+    key = (((pts.astype(np.int64) << 10) | gd) << 10 | gf.astype(np.int64)) << 10
+    key |= rng.integers(0, 1024, size=(T, S))      # žreb pri popolnem izenačenju
+    order = np.argsort(-key, axis=0)
+    pos = np.empty_like(order)
+    np.put_along_axis(pos, order, np.arange(T)[:, None], axis=0)
+    return pos
+
+def simulate_season(teams, played, remaining, lam_h, lam_a, lam_s, sims=SIMS,
+                    chunk=CHUNK, rng=None):
+    """Porazdelitev končnih mest (ekipe × mesta) in pričakovane točke / gol razlika."""
+    rng = rng or np.random.default_rng()
+    T = len(teams)
+    pts0, gf0, ga0 = table(teams, played)
+    Mh, Ma = incidence(teams, remaining)
+    pos_count = np.zeros((T, T), dtype=np.int64)
+    sum_pts = np.zeros(T)
+    sum_gd = np.zeros(T)
+    for s0 in range(0, sims, chunk):
+        S = min(chunk, sims - s0)
+        if len(remaining):
+            H, A = ptb.simulate(lam_h, lam_a, lam_s, S, rng)       # (tekme, S)
+            win, draw = (H > A).astype(float), (H == A).astype(float)
+            pts = Mh @ (3 * win + draw) + Ma @ (3 * (1 - win - draw) + draw)
+            gf = Mh @ H + Ma @ A
+            ga = Mh @ A + Ma @ H
+        else:
+            pts, gf, ga = (np.zeros((T, S)) for _ in range(3))
+        pts += pts0[:, None]
+        gf += gf0[:, None]
+        ga += ga0[:, None]
+        pos = rank(pts, gf, ga, rng)
+        pos_count += np.bincount((np.arange(T)[:, None] * T + pos).ravel(),
+                                 minlength=T * T).reshape(T, T)
+        sum_pts += pts.sum(axis=1)
+        sum_gd += (gf - ga).sum(axis=1)
+    return dict(pts=pts0, gd=gf0 - ga0, pos=pos_count / sims,
+                exp_pts=sum_pts / sims, exp_gd=sum_gd / sims)
+
+def summary_table(teams, res, top_n=TOP_N, relegated=RELEGATED):
+    T = len(teams)
+    P = res["pos"]
+    out = pd.DataFrame({
+        "team": teams, "pts": res["pts"].astype(int), "gd": res["gd"].astype(int),
+        "exp_pts": res["exp_pts"], "exp_gd": res["exp_gd"],
+        "exp_pos": P @ np.arange(1, T + 1),
+        "p_title": P[:, 0], f"p_top{top_n}": P[:, :top_n].sum(axis=1),
+        "p_releg": P[:, T - relegated:].sum(axis=1),
+    })
+    for k in range(T):
+        out[f"p{k + 1}"] = P[:, k]
+    return out.sort_values(["exp_pts", "exp_gd"], ascending=False, ignore_index=True)
+
+# ──────────────────────────────────────────────────────────────
+def main(csv, asof=None, matchweek=None, sims=SIMS, chunk=CHUNK, seed=None,
+         out=OUT_DEFAULT, engine=ptb.ENGINE, xi=0.0, league=None, season=None, fixtures=None):
+    df = ptb.read_season(csv, league, season)
+    if fixtures is not None:
+        df = with_schedule(df, ptb.read_season(fixtures, league, season))
+    played, remaining = split_season(df, asof, matchweek)
+    if played.empty:
+        sys.exit("Ni odigranih tekem – modela ni mogoče oceniti.")
+    if remaining.empty:
+        sys.exit("Ni preostalih tekem – izberi --asof ali --matchweek "
+                 "(ali --fixtures z razporedom, če CSV vsebuje le odigrane tekme).")
+    teams = ptb.team_index(df)
+
+    model = ptb.fit_model(played, played.iloc[:0], engine=engine, xi=xi)
+    lam_h, lam_a, lam_s = ptb.fixture_lambdas(model, played, remaining)
+    if np.isnan(lam_h).any() or np.isnan(lam_a).any():
+        sys.exit("Nekatere ekipe preostalih tekem še nimajo odigrane tekme doma in v gosteh.")
+
+    t0 = time.perf_counter()
+    res = simulate_season(teams, played, remaining, lam_h, lam_a, lam_s, sims, chunk,
+                          np.random.default_rng(seed))
+    el = time.perf_counter() - t0
+    tab = summary_table(teams, res)
+    tab.to_csv(out, index=False, float_format="%.4f")
+
+    print(f"\n{len(played)} odigranih, {len(remaining)} preostalih tekem, "
+          f"{sims:,} sezon v {el:.2f}s\n")
+    cols = ["team", "pts", "exp_pts", "exp_pos", "p_title", f"p_top{TOP_N}", "p_releg"]
+    print(tab[cols].to_string(index=False, float_format="%.3f"))
+    print(f"\nPorazdelitev mest shranjena v '{out}'.")
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("csv", nargs="?", default=ptb.CSV_DEFAULT,
+                    help="CSV ali imenik shrambe match_store")
+    ap.add_argument("--league")
+    ap.add_argument("--season")
+    ap.add_argument("--asof", help="upoštevaj le tekme pred tem datumom (YYYY-MM-DD)")
+    ap.add_argument("--matchweek", type=int, help="upoštevaj le kroge pred tem krogom")
+    ap.add_argument("--fixtures", help="razpored (npr. scrape_pl_24_25_02.csv) z neodigranimi tekmami")
+    ap.add_argument("--sims", type=int, default=SIMS)
+    ap.add_argument("--chunk", type=int, default=CHUNK)
+    ap.add_argument("--seed", type=int)
+    ap.add_argument("--model", choices=("tables", "dc"), default=ptb.ENGINE)
+    ap.add_argument("--xi", type=float, default=0.0)
+    ap.add_argument("--out", default=OUT_DEFAULT)
+    args = ap.parse_args()
+    for path in (args.csv, args.fixtures):
+        if path and not pathlib.Path(path).exists():
+            sys.exit(f"CSV datoteka '{path}' ne obstaja.")
+    main(args.csv, args.asof, args.matchweek, args.sims, args.chunk, args.seed, args.out,
+         args.model, args.xi, args.league, args.season, args.fixtures)
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Lahki merilniki korakov za napovedovalnik (in druge skripte)
+• with stage_timer.stage("fit_model"): ...   → čas in število klicev koraka
+• stage_timer.count("fixtures", n)           → števci (tekme, simulacije …)
+• gnezdeni koraki dobijo pot: "predict_fixtures/fixture_lambdas/form"
+• enable(cpu=True)  → cProfile čez cel zagon (.prof + najdražje funkcije v poročilu)
+  enable(mem=True)  → tracemalloc: vrh pomnilnika vsakega koraka
+• report(path)      → JSON poročilo (časi, števci, okolje)
+
+Izklopljeno (privzeto) stage() vrne vedno isti prazen kontekst in count() takoj
+vrne – v napovedi ostane le klic funkcije na korak.
+"""
+
+import json, time, pathlib, platform, contextlib, cProfile, pstats, tracemalloc
+
+CPU_TOP = 25               # toliko najdražjih funkcij (cumtime) gre v poročilo
+
+_NULL = contextlib.nullcontext()
+_on = _cpu = _mem = False
+_frames = []               # odprti koraki: [ime, t0, osnova pomnilnika, vrh podkorakov]
+_stages = {}               # pot → {"calls", "time_s"[, "peak_mb"]}
+_counters = {}
+_profiler = None
+_t0 = 0.0
+
+# ──────────────────────────────────────────────────────────────
+def enable(cpu=False, mem=False):
+    """Vklopi merjenje (in počisti prejšnje meritve)."""
+    global _on, _cpu, _mem, _profiler, _t0
+    _frames.clear(); _stages.clear(); _counters.clear()
+    _on, _cpu, _mem = True, cpu, mem
+    if mem:
+        tracemalloc.start()
+    _profiler = cProfile.Profile() if cpu else None
+    _t0 = time.perf_counter()
+    if _profiler:
+        _profiler.enable()
+
+def disable():
+    global _on, _profiler
+    if _profiler:
+        _profiler.disable()
+    if _mem and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    _on = False
+
+def enabled():
+    return _on
+
+def stage(name):
+    """Kontekst, ki izmeri korak; izklopljeno → nullcontext brez dela."""
+    return _timed(name) if _on else _NULL
+
+def count(name, n=1):
+    if _on:
+        _counters[name] = _counters.get(name, 0) + n
+
+@contextlib.contextmanager
+def _timed(name):
+    base = 0
+    if _mem:
+        cur, peak = tracemalloc.get_traced_memory()
+        if _frames:                          # vrh starša do zdaj, preden ga ponastavimo
+            _frames[-1][3] = max(_frames[-1][3], peak)
+        tracemalloc.reset_peak()
+        base = cur
+    frame = [name, time.perf_counter(), base, 0]
+    _frames.append(frame)
+    # zapis ob vstopu → poročilo ima korake v vrstnem redu izvajanja (starš pred otroki)
+    rec = _stages.setdefault("/".join(f[0] for f in _frames), {"calls": 0, "time_s": 0.0})
+    try:
+        yield
+    finally:
+        el = time.perf_counter() - frame[1]
+        _frames.pop()
+        rec["calls"] += 1
+        rec["time_s"] += el
+        if _mem:
+            peak = max(frame[3], tracemalloc.get_traced_memory()[1])
+            rec["peak_mb"] = max(rec.get("peak_mb", 0.0), (peak - frame[2]) / 2**20)
+            if _frames:
+                _frames[-1][3] = max(_frames[-1][3], peak)
+
+# ──────────────────────────────────────────────────────────────
+def _cpu_top(path, n=CPU_TOP):
+    _profiler.dump_stats(path)
+    st = pstats.Stats(_profiler)
+    rows = sorted(st.stats.items(), key=lambda kv: kv[1][3], reverse=True)[:n]
+    return [{"func": f"{file}:{line}({func})", "calls": nc, "tottime": tt, "cumtime": ct}
+            for (file, line, func), (cc, nc, tt, ct, _) in rows]
+
+def report(path, **meta):
+    """Ustavi merjenje in zapiše JSON poročilo; vrne ga tudi kot dict."""
+    total = time.perf_counter() - _t0
+    disable()
+    path = pathlib.Path(path)
+    rep = {
+        "total_s": total,
+        "stages": [{"stage": k, **v} for k, v in _stages.items()],
+        "counters": dict(_counters),
+        "meta": {"python": platform.python_version(), "platform": platform.platform(),
+                 "cpu_profile": _cpu, "memory": _mem, **meta},
+    }
+    if _cpu:
+        prof = path.with_suffix(".prof")
+        rep["cpu_top"] = _cpu_top(prof)
+        rep["meta"]["cpu_profile_file"] = str(prof)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(rep, f, indent=2, default=str)
+    return rep
+
+def format_report(rep):
+    """Kratka tabela korakov za izpis v konzolo."""
+    lines = [f"{'korak':<44} {'klici':>6} {'ms':>10} {'%':>6}"
+             + (f" {'MB':>8}" if rep["meta"]["memory"] else "")]
+    for s in rep["stages"]:
+        depth = s["stage"].count("/")
+        name = "  " * depth + s["stage"].rsplit("/", 1)[-1]
+        line = (f"{name:<44} {s['calls']:>6} {s['time_s'] * 1000:>10.2f} "
+                f"{s['time_s'] / rep['total_s']:>6.1%}")
+        if "peak_mb" in s:
+            line += f" {s['peak_mb']:>8.1f}"
+        lines.append(line)
+    lines.append(f"{'skupaj':<44} {'':>6} {rep['total_s'] * 1000:>10.2f}")
+    if rep["counters"]:
+        lines.append("števci: " + ", ".join(f"{k}={v:,}" for k, v in rep["counters"].items()))
+    return "\n".join(lines)
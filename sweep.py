@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Preiskovanje mreže parametrov napovedovalnika (walk-forward backtest) na vseh jedrih
+• vsaka konfiguracija = en klic backtest.run_backtest
+• tekme in shrambe značilk (feature_store, ena na vrednost form_n) se pripravijo
+  enkrat in se delavcem predajo ob zagonu bazena (samo za branje), ne z vsako nalogo
+• rezultat: tabela konfiguracij, razvrščena po izbrani meri (privzeto log-loss)
+
+Mreža: --grid ime=v1,v2,... (imena = argumenti run_backtest), npr.
+    python sweep.py --grid form_weight=0,0.1,0.2,0.3 form_n=3,5,8 calib_weeks=0,3
+    python sweep.py --grid window=none,8,12 ls_floor=0.01,0.05 --workers 4
+Vrednost "none" pomeni None (npr. window=none → vsi krogi).
+Train/valid rez iz load_matches ustreza calib_weeks (zadnji krogi pred napovedjo za kalibracijo).
+"""
+
+import sys, os, time, argparse, pathlib, itertools, numpy as np, pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+
+import predict_tot_bha as ptb
+import backtest
+import feature_store
+
+OUT_DEFAULT = "sweep.csv"
+METRICS     = ("log_loss", "brier", "rps")
+GRID_DEFAULT = {
+    "form_weight": [0.0, 0.1, 0.2, 0.3, 0.4],
+    "form_n":      [3, 5, 8],
+    "calib_weeks": [0, 3],     # < FIRST_MW - 1, sicer prvi krogi nimajo učnih tekem
+    "ls_floor":    [0.01, 0.05, 0.1],
+    "window":      [None, 10],
+}
+PARAMS = ("start", "window", "form_weight", "form_n", "calib_weeks", "calib",
+          "ls_floor", "engine", "xi")
+
+# ──────────────────────────────────────────────────────────────
+def _value(s):
+    if s.lower() == "none":
+        return None
+    for cast in (int, float):
+        try:
+            return cast(s)
+        except ValueError:
+            pass
+    return s
+
+def parse_grid(items):
+    grid = {}
+    for item in items:
+        name, _, vals = item.partition("=")
+        if name not in PARAMS or not vals:
+            raise ValueError(f"Neveljaven parameter mreže '{item}' (dovoljeni: {', '.join(PARAMS)}).")
+        grid[name] = [_value(v) for v in vals.split(",")]
+    return grid
+
+def configs(grid):
+    """Vse kombinacije mreže; neveljavna kombinacija (prazno učno okno) → ValueError."""
+    names = list(grid)
+    cfgs = [dict(zip(names, vals)) for vals in itertools.product(*grid.values())]
+    for cfg in cfgs:
+        start, cw, window = (cfg.get("start", backtest.FIRST_MW), cfg.get("calib_weeks", 0),
+                             cfg.get("window"))
+        if not 0 <= cw < start - 1:
+            raise ValueError(f"calib_weeks={cw} pri start={start} ne pusti učnih krogov "
+                             f"(dovoljeno 0 … {start - 2}).")
+        if window is not None and window < 1:
+            raise ValueError(f"window={window} mora biti vsaj 1.")
+    return cfgs
+
+# stanje delavca: nastavi se enkrat ob zagonu procesa
+_DF = _FS = None
+
+def _init(df, stores):
+    global _DF, _FS
+    _DF, _FS = df, stores
+
+def _evaluate(cfg):
+    fs = _FS[cfg.get("form_n", 5)]
+    return {**cfg, **backtest.summary(backtest.run_backtest(_DF, fs, **cfg))}
+
+def run_sweep(df, grid, workers=None, metric="log_loss", log=print):
+    """Oceni vse konfiguracije mreže; vrne tabelo, razvrščeno po metric (manj = bolje)."""
+    cfgs = configs(grid)
+    stores = {n: feature_store.build(df, n) for n in {c.get("form_n", 5) for c in cfgs}}
+    workers = workers or os.cpu_count() or 1
+    chunk = max(1, len(cfgs) // (workers * 8))
+    rows, t0 = [], time.perf_counter()
+    if workers == 1:
+        _init(df, stores)
+        results = map(_evaluate, cfgs)
+    else:
+        pool = ProcessPoolExecutor(workers, initializer=_init, initargs=(df, stores))
+        results = pool.map(_evaluate, cfgs, chunksize=chunk)
+    try:
+        for i, r in enumerate(results, 1):
+            rows.append(r)
+            if log and (i % max(1, len(cfgs) // 10) == 0 or i == len(cfgs)):
+                el = time.perf_counter() - t0
+                log(f"  {i}/{len(cfgs)} konfiguracij, {el:.0f}s (še ~{el / i * (len(cfgs) - i):.0f}s)")
+    finally:
+        if workers > 1:
+            pool.shutdown()
+    res = pd.DataFrame(rows).sort_values(metric, kind="stable", ignore_index=True)
+    res.insert(0, "rank", np.arange(1, len(res) + 1))
+    return res
+
+# ──────────────────────────────────────────────────────────────
+def main(csv, grid, out=OUT_DEFAULT, workers=None, metric="log_loss", top=10,
+         league=None, season=None):
+    df = ptb.read_season(csv, league, season)
+    df = df[df["home_goals"].notna()].reset_index(drop=True)
+    n = int(np.prod([len(v) for v in grid.values()]))
+    print(f"{n} konfiguracij, {workers or os.cpu_count()} procesov ...")
+    res = run_sweep(df, grid, workers, metric)
+    res.to_csv(out, index=False, float_format="%.5f")
+    print(f"\nNajboljših {top} po {metric}:")
+    print(res.head(top).to_string(index=False, float_format="%.4f"))
+    print(f"Rezultati shranjeni v '{out}'.")
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("csv", nargs="?", default=ptb.CSV_DEFAULT,
+                    help="CSV ali imenik shrambe match_store")
+    ap.add_argument("--league")
+    ap.add_argument("--season")
+    ap.add_argument("--grid", nargs="+", metavar="IME=V1,V2",
+                    help="mreža parametrov (privzeto GRID_DEFAULT)")
+    ap.add_argument("--workers", type=int, help="število procesov (privzeto vsa jedra)")
+    ap.add_argument("--metric", choices=METRICS, default="log_loss")
+    ap.add_argument("--top", type=int, default=10)
+    ap.add_argument("--out", default=OUT_DEFAULT)
+    args = ap.parse_args()
+    if not pathlib.Path(args.csv).exists():
+        sys.exit(f"CSV datoteka '{args.csv}' ne obstaja.")
+    try:
+        grid = parse_grid(args.grid) if args.grid else GRID_DEFAULT
+        configs(grid)
+    except ValueError as exc:
+        sys.exit(str(exc))
+    main(args.csv, grid, args.out, args.workers, args.metric, args.top,
+         args.league, args.season)